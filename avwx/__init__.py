@@ -8,6 +8,12 @@ from datetime import datetime, timezone
 
 # module
 from avwx import (
+    _core,
+    archive,
+    cache,
+    climate,
+    codec,
+    history,
     metar,
     pirep,
     service,
@@ -36,9 +42,6 @@ class Report:
     #: ReportData dataclass of parsed data values and units. Parsed on update()
     data: structs.ReportData = None
 
-    #: ReportTrans dataclass of translation strings from data. Parsed on update()
-    translations: structs.ReportTrans = None
-
     #: Units inferred from the station location and report contents
     units: structs.Units = None
 
@@ -59,11 +62,34 @@ class Report:
         self.service = service.get_service(icao, self.station_info.country)(
             self.__class__.__name__.lower()
         )
+        # Values calculated from data on first access. Cleared by update()
+        self._calculated = {}
 
     @abstractmethod
     def _post_update(self):
         pass
 
+    @abstractmethod
+    def _translate(self) -> structs.ReportTrans:
+        pass
+
+    def _lazy(self, key: str, func: "Callable") -> object:
+        """
+        Returns a value calculated from data, running func on first access
+        """
+        if key not in self._calculated:
+            self._calculated[key] = func()
+        return self._calculated[key]
+
+    @property
+    def translations(self) -> structs.ReportTrans:
+        """
+        ReportTrans dataclass of translation strings from data. Calculated on first access
+        """
+        if not self.data:
+            return None
+        return self._lazy("translations", self._translate)
+
     @classmethod
     def from_report(cls, report: str) -> "Report":
         """
@@ -88,6 +114,7 @@ class Report:
         if not report or report == self.raw:
             return False
         self.raw = report
+        self._calculated.clear()
         if not disable_post:
             self._post_update()
         self.last_updated = datetime.utcnow().replace(tzinfo=timezone.utc)
@@ -101,6 +128,7 @@ class Report:
         if not report or report == self.raw:
             return False
         self.raw = report
+        self._calculated.clear()
         if not disable_post:
             self._post_update()
         return True
@@ -116,7 +144,9 @@ class Metar(Report):
 
     def _post_update(self):
         self.data, self.units = metar.parse(self.station, self.raw)
-        self.translations = translate.metar(self.data, self.units)
+
+    def _translate(self) -> structs.MetarTrans:
+        return translate.metar(self.data, self.units)
 
     @property
     def summary(self) -> str:
@@ -125,7 +155,7 @@ class Metar(Report):
         """
         if not self.translations:
             self.update()
-        return summary.metar(self.translations)
+        return self._lazy("summary", lambda: summary.metar(self.translations))
 
     @property
     def speech(self) -> str:
@@ -134,7 +164,7 @@ class Metar(Report):
         """
         if not self.data:
             self.update()
-        return speech.metar(self.data, self.units)
+        return self._lazy("speech", lambda: speech.metar(self.data, self.units))
 
 
 class Taf(Report):
@@ -144,7 +174,9 @@ class Taf(Report):
 
     def _post_update(self):
         self.data, self.units = taf.parse(self.station, self.raw)
-        self.translations = translate.taf(self.data, self.units)
+
+    def _translate(self) -> structs.TafTrans:
+        return translate.taf(self.data, self.units)
 
     @property
     def summary(self) -> [str]:
@@ -153,7 +185,10 @@ class Taf(Report):
         """
         if not self.translations:
             self.update()
-        return [summary.taf(trans) for trans in self.translations.forecast]
+        return self._lazy(
+            "summary",
+            lambda: [summary.taf(trans) for trans in self.translations.forecast],
+        )
 
     @property
     def speech(self) -> str:
@@ -162,7 +197,7 @@ class Taf(Report):
         """
         if not self.data:
             self.update()
-        return speech.taf(self.data, self.units)
+        return self._lazy("speech", lambda: speech.taf(self.data, self.units))
 
 
 class Reports:
@@ -178,7 +213,7 @@ class Reports:
 
     raw: [str] = None
     data: [structs.ReportData] = None
-    units: structs.Units = structs.Units(**static.NA_UNITS)
+    units: structs.Units = _core.UNITS["NA"]
 
     def __init__(self, station_ident: str = None, lat: float = None, lon: float = None):
         if station_ident:
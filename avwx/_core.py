@@ -3,10 +3,13 @@ Contains the core parsing and indent functions of avwx
 """
 
 # stdlib
+import dataclasses
+import os
 import re
 from calendar import monthrange
-from copy import copy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
 from itertools import permutations
 
 # library
@@ -20,20 +23,22 @@ from avwx.static import (
     CLOUD_TRANSLATIONS,
     FLIGHT_RULES,
     FRACTIONS,
+    IN_UNITS,
     METAR_RMK,
+    NA_UNITS,
     NUMBER_REPL,
     SPECIAL_NUMBERS,
     TAF_NEWLINE,
     TAF_NEWLINE_STARTSWITH,
     TAF_RMK,
 )
-from avwx.structs import Cloud, Fraction, Number, Timestamp, Units
+from avwx.structs import Cloud, Deferred, Fraction, Number, Timestamp, Units
 
 
 def dedupe(items: list, only_neighbors: bool = False) -> list:
     """
     Deduplicate a list while keeping order
-    
+
     If only_neighbors is True, dedupe will only check neighboring values
     """
     ret = []
@@ -104,11 +109,78 @@ def spoken_number(num: str) -> str:
     return " and ".join(ret)
 
 
+def _spoken_fraction(num: str) -> str:
+    """
+    Returns the spoken version of a packed fraction string
+    """
+    return spoken_number(unpack_fraction(num))
+
+
+class StructCache:
+    """
+    Bounded LRU cache in front of a struct builder
+
+    Results are shared between every caller, so cached structs must be frozen
+    """
+
+    def __init__(self, func: "Callable", maxsize: int = 4096):
+        self._func = func
+        self.resize(maxsize)
+
+    def __call__(self, *args) -> object:
+        return self._call(*args)
+
+    def resize(self, maxsize: int):
+        """
+        Sets the max number of cached results and clears the cache
+
+        A maxsize of 0 disables the cache. None removes the size limit
+        """
+        self.maxsize = maxsize
+        if maxsize == 0:
+            self._call = self._func
+        else:
+            self._call = lru_cache(maxsize=maxsize)(self._func)
+
+    def clear(self):
+        """
+        Removes all cached results and resets the stats
+        """
+        if self.maxsize != 0:
+            self._call.cache_clear()
+
+    def info(self) -> {str: object}:
+        """
+        Returns the cache hits, misses, current size, max size, and hit rate
+        """
+        if self.maxsize == 0:
+            hits, misses, size = 0, 0, 0
+        else:
+            hits, misses, _, size = self._call.cache_info()
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "size": size,
+            "maxsize": self.maxsize,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+
 def make_number(num: str, repr: str = None, speak: str = None) -> Number:
     """
     Returns a Number or Fraction dataclass for a number string
 
     NOTE: Numerators are assumed to have a single digit. Additional are whole numbers
+
+    Results are cached and shared. See NUMBER_CACHE
+    """
+    return NUMBER_CACHE(num, repr, speak)
+
+
+def _make_number(num: str, repr: str, speak: str) -> Number:
+    """
+    Builds a new Number or Fraction for make_number
     """
     if not num or is_unknown(num):
         return
@@ -134,8 +206,9 @@ def make_number(num: str, repr: str = None, speak: str = None) -> Number:
             num = f"{nmr}/{dnm}"
         else:
             nmr = int(nmr)
-        unpacked = unpack_fraction(num)
-        spoken = spoken_number(unpacked)
+        # Spoken and normalized strings are only built if read
+        spoken = Deferred(_spoken_fraction, num)
+        unpacked = Deferred(unpack_fraction, num)
         return Fraction(repr or num, nmr / dnm, spoken, nmr, dnm, unpacked)
     # Handle Minus values with errors like 0M04
     if "M" in num:
@@ -148,7 +221,53 @@ def make_number(num: str, repr: str = None, speak: str = None) -> Number:
     if not val:
         return
     val = float(val) if "." in num else int(val)
-    return Number(repr or num, val, spoken_number(speak or str(val)))
+    return Number(repr or num, val, Deferred(spoken_number, speak or str(val)))
+
+
+#: Cache of Number and Fraction results shared by make_number
+NUMBER_CACHE = StructCache(_make_number)
+
+_SHARED_UNITS = {}
+
+
+def shared_units(units: Units) -> Units:
+    """
+    Returns the shared Units instance equal to the given units
+    """
+    return _SHARED_UNITS.setdefault(units, units)
+
+
+def change_units(units: Units, **changes: str) -> Units:
+    """
+    Returns the shared Units instance with some unit values changed
+    """
+    if all(getattr(units, key) == value for key, value in changes.items()):
+        return units
+    return shared_units(dataclasses.replace(units, **changes))
+
+
+#: Shared starting units for the North American and International report variants
+UNITS = {"NA": shared_units(Units(**NA_UNITS)), "IN": shared_units(Units(**IN_UNITS))}
+
+
+def intern_token(item: str) -> str:
+    """
+    Returns a shared copy of a repeated report token like a wx code or station ident
+
+    Tokens are shared through a bounded table. See TOKEN_CACHE
+    """
+    return TOKEN_CACHE(item)
+
+
+def _same(item: str) -> str:
+    """
+    Returns the first copy of a token seen by TOKEN_CACHE
+    """
+    return item
+
+
+#: Table of token copies shared by intern_token
+TOKEN_CACHE = StructCache(_same, maxsize=16384)
 
 
 def find_first_in_list(txt: str, str_list: [str]) -> int:
@@ -180,6 +299,136 @@ def is_timerange(item: str) -> bool:
     )
 
 
+# Token classes set by classify_token. A token can belong to more than one
+TOKEN_WIND = 1
+TOKEN_GUST = 1 << 1
+TOKEN_VARIABLE_WIND = 1 << 2
+TOKEN_VISIBILITY = 1 << 3
+TOKEN_CLOUD = 1 << 4
+TOKEN_RVR = 1 << 5
+TOKEN_WIND_SHEAR = 1 << 6
+TOKEN_TEMP_DEW = 1 << 7
+TOKEN_TEMP_MIN_MAX = 1 << 8
+TOKEN_ALTIMETER = 1 << 9
+TOKEN_ICING = 1 << 10
+TOKEN_TURBULENCE = 1 << 11
+TOKEN_TIMERANGE = 1 << 12
+
+
+def _clean_wind(item: str) -> str:
+    """
+    Returns a wind element with common typos removed
+    """
+    item = item.replace("(E)", "")
+    for replacements in (("O", "0"), ("/", ""), ("LKT", "KT"), ("GG", "G")):
+        item = item.replace(*replacements)
+    return item
+
+
+def _is_wind(item: str) -> bool:
+    """
+    Returns True if a cleaned item matches a wind format. Ex: 09010KT, 09010G15KT
+    """
+    return (
+        item.endswith("KT")
+        or item.endswith("KTS")
+        or item.endswith("MPS")
+        or item.endswith("KMH")
+        or (
+            (len(item) == 5 or (len(item) >= 8 and "G" in item))
+            and (item[:5].isdigit() or (item.startswith("VRB") and item[3:5].isdigit()))
+        )
+    )
+
+
+def _is_visibility(item: str) -> bool:
+    """
+    Returns True if a single item matches a visibility format
+    """
+    ilen = len(item)
+    return (
+        item.endswith("SM")
+        or (ilen == 4 and item.isdigit())
+        or (
+            7 >= ilen >= 5
+            and item[:4].isdigit()
+            and (item[4] in ["M", "N", "S", "E", "W"] or item[4:] == "NDV")
+        )
+        or (ilen == 5 and item[1:].isdigit() and item[0] in ["M", "P", "B"])
+        or (item.endswith("KM") and item[:-2].isdigit())
+    )
+
+
+def _split_temp_dew(item: str) -> [str]:
+    """
+    Returns the temperature and dewpoint strings in an item or None if not a match
+    """
+    # ///07
+    if item[0] == "/":
+        item = "/" + item.lstrip("/")
+    # 07///
+    elif item[-1] == "/":
+        item = item.rstrip("/") + "/"
+    tempdew = item.split("/")
+    if len(tempdew) != 2:
+        return None
+    for i, temp in enumerate(tempdew):
+        if temp in ["MM", "XX"]:
+            tempdew[i] = ""
+        elif not is_possible_temp(temp):
+            return None
+    return tempdew
+
+
+@lru_cache(maxsize=4096)
+def classify_token(item: str) -> int:
+    """
+    Returns the combined TOKEN_* classes matched by a single report element
+
+    Results are cached since most elements repeat across reports
+    """
+    tags = 0
+    if not item:
+        return tags
+    ilen = len(item)
+    if _is_wind(_clean_wind(item)):
+        tags |= TOKEN_WIND
+    if 1 < ilen < 4 and item[0] == "G" and item[1:].isdigit():
+        tags |= TOKEN_GUST
+    if ilen == 7 and item[:3].isdigit() and item[3] == "V" and item[4:].isdigit():
+        tags |= TOKEN_VARIABLE_WIND
+    if _is_visibility(item):
+        tags |= TOKEN_VISIBILITY
+    if item[:3] in CLOUD_LIST or item[:2] == "VV":
+        tags |= TOKEN_CLOUD
+    if (
+        ilen > 4
+        and item[0] == "R"
+        and (item[3] == "/" or item[4] == "/")
+        and item[1:3].isdigit()
+    ):
+        tags |= TOKEN_RVR
+    if ilen > 6 and item.startswith("WS") and item[5] == "/":
+        tags |= TOKEN_WIND_SHEAR
+    if "/" in item:
+        if _split_temp_dew(item) is not None:
+            tags |= TOKEN_TEMP_DEW
+        if ilen > 6 and item[0] == "T":
+            tags |= TOKEN_TEMP_MIN_MAX
+    if (ilen > 6 and item.startswith("QNH") and item[3:7].isdigit()) or (
+        ilen == 5 and item[0] in ("A", "Q") and item[1:].isdigit()
+    ):
+        tags |= TOKEN_ALTIMETER
+    if item.isdigit():
+        if item[0] == "6":
+            tags |= TOKEN_ICING
+        elif item[0] == "5":
+            tags |= TOKEN_TURBULENCE
+    if is_timerange(item):
+        tags |= TOKEN_TIMERANGE
+    return tags
+
+
 def get_remarks(txt: str) -> ([str], str):
     """
     Returns the report split into components and the remarks string
@@ -256,6 +505,99 @@ STR_REPL = {
 }
 
 
+class _Replacer:
+    """
+    Applies an ordered dict of string replacements in a few scans of the string
+
+    Runs of multi-character keys become one regex built as a prefix tree.
+    Single characters and keys padded with spaces on both sides are cheaper as
+    str.replace. The result matches applying each replacement in order
+    """
+
+    def __init__(self, repl: dict):
+        self.passes = []
+        group, use_regex = [], None
+        for key, rep in repl.items():
+            # Keys padded on both sides can share a space with their neighbor
+            regex_key = len(key) > 1 and not (key[0] == key[-1] == " ")
+            if group and regex_key != use_regex:
+                self.passes.append(self._make_pass(group, use_regex))
+                group = []
+            group.append((key, rep))
+            use_regex = regex_key
+        if group:
+            self.passes.append(self._make_pass(group, use_regex))
+
+    def __call__(self, txt: str) -> str:
+        for func in self.passes:
+            txt = func(txt)
+        return txt
+
+    @staticmethod
+    def _make_pass(group: [(str, str)], use_regex: bool) -> "Callable":
+        """
+        Returns a function applying a group of replacements
+        """
+        if not use_regex:
+
+            def replace(txt: str) -> str:
+                for key, rep in group:
+                    txt = txt.replace(key, rep)
+                return txt
+
+            return replace
+        # An earlier replacement can create a later key. Ex: CALMKKT -> CALMKT -> CALM
+        chained = []
+        for i, (key, rep) in enumerate(group):
+            for prev_key, prev_rep in group[:i]:
+                if prev_rep and prev_rep in key:
+                    chained.append((key.replace(prev_rep, prev_key, 1), rep))
+            chained.append((key, rep))
+        # Trailing spaces are matched but not consumed so the next key can use them
+        trie, reps = {}, {}
+        for key, rep in chained:
+            atoms = [re.escape(char) for char in key]
+            if key[-1] == rep[-1:] == " ":
+                atoms[-1], key, rep = "(?= )", key[:-1], rep[:-1]
+            reps.setdefault(key, rep)
+            node = trie
+            for atom in atoms:
+                node = node.setdefault(atom, {})
+            node[""] = {}
+        regex = re.compile(_trie_pattern(trie))
+        return partial(regex.sub, lambda match: reps[match.group()])
+
+
+def _trie_pattern(node: dict) -> str:
+    """
+    Returns a regex pattern matching every path in a prefix tree
+    """
+    alts = [atom + _trie_pattern(child) for atom, child in node.items() if atom]
+    if not alts:
+        return ""
+    pattern = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        pattern = "(?:" + pattern + ")?"
+    return pattern
+
+
+_STR_REPL = _Replacer(STR_REPL)
+
+
+# Cloud layer not preceded by a space but followed by a three digit or unknown base
+_CLOUD_NO_SPACE = re.compile(
+    r"(?<! )(" + "|".join(CLOUD_LIST) + r")(?=\d{3}|\d{1,2}\Z|/{3}|/{0,2}\Z)"
+)
+
+
+def _space_cloud(clouds: [str], match: "re.Match") -> str:
+    """
+    Returns the matched cloud layer with a leading space if it is in clouds
+    """
+    cloud = match.group()
+    return " " + cloud if cloud in clouds else cloud
+
+
 def sanitize_report_string(txt: str) -> str:
     """
     Provides sanitization for operations that work better when the report is a string
@@ -270,26 +612,12 @@ def sanitize_report_string(txt: str) -> str:
     # Prevent changes to station ID
     stid, txt = txt[:4], txt[4:]
     # Replace invalid key-value pairs
-    for key, rep in STR_REPL.items():
-        txt = txt.replace(key, rep)
+    txt = _STR_REPL(txt)
     # Check for missing spaces in front of cloud layers
     # Ex: TSFEW004SCT012FEW///CBBKN080
-    for cloud in CLOUD_LIST:
-        if cloud in txt and " " + cloud not in txt:
-            start, counter = 0, 0
-            while txt.count(cloud) != txt.count(" " + cloud):
-                cloud_index = start + txt[start:].find(cloud)
-                if len(txt[cloud_index:]) >= 3:
-                    target = txt[
-                        cloud_index + len(cloud) : cloud_index + len(cloud) + 3
-                    ]
-                    if target.isdigit() or not target.strip("/"):
-                        txt = txt[:cloud_index] + " " + txt[cloud_index:]
-                start = cloud_index + len(cloud) + 1
-                # Prevent infinite loops
-                if counter > txt.count(cloud):
-                    break
-                counter += 1
+    missing = [c for c in CLOUD_LIST if c in txt and " " + c not in txt]
+    if missing:
+        txt = _CLOUD_NO_SPACE.sub(partial(_space_cloud, missing), txt)
     return stid + txt
 
 
@@ -457,49 +785,58 @@ def sanitize_report_list(wxdata: [str], remove_clr_and_skc: bool = True) -> [str
     Sanitize wxData
 
     We can remove and identify "one-off" elements and fix other issues before parsing a line
+
+    Returns a new list. The given list is not modified
     """
-    for i, item in reversed(list(enumerate(wxdata))):
+    # Walk from the end so an item can be joined onto the one before it. Checks
+    # use the original item. Cleaned items are collected in reverse
+    ret, joined = [], ""
+    for i in range(len(wxdata) - 1, -1, -1):
+        item = wxdata[i]
         ilen = len(item)
+        # Item with anything joined onto it and any elements split off of it
+        fixed, extra, joined = item + joined, (), ""
         # Remove elements containing only '/'
         if is_unknown(item):
-            wxdata.pop(i)
+            continue
         # Remove empty wind /////KT
         if item.endswith("KT") and is_unknown(item[:-2]):
-            wxdata.pop(i)
+            continue
         # Remove RE from wx codes, REVCTS -> VCTS
         elif ilen in [4, 6] and item.startswith("RE"):
-            wxdata[i] = item[2:]
+            fixed = item[2:]
         # Fix a slew of easily identifiable conditions where a space does not belong
         elif i and extra_space_exists(wxdata[i - 1], item):
-            wxdata[i - 1] += wxdata.pop(i)
+            joined = fixed
+            continue
         # Remove spurious elements
         elif item in ITEM_REMV:
-            wxdata.pop(i)
+            continue
         # Remove 'Sky Clear' from METAR but not TAF
         elif remove_clr_and_skc and item in ["CLR", "SKC"]:
-            wxdata.pop(i)
+            continue
         # Replace certain items
         elif item in ITEM_REPL:
-            wxdata[i] = ITEM_REPL[item]
+            fixed = ITEM_REPL[item]
         # Remove amend signifier from start of report ('CCA', 'CCB',etc)
         elif ilen == 3 and item.startswith("CC") and item[2].isalpha():
-            wxdata.pop(i)
+            continue
         # Fix inconsistent 'P6SM' Ex: TP6SM or 6PSM -> P6SM
         elif ilen > 3 and item[-4:] in VIS_PERMUTATIONS:
-            wxdata[i] = "P6SM"
+            fixed = "P6SM"
         # Fix misplaced KT 22022KTG40
         elif ilen == 10 and "KTG" in item and item[:5].isdigit():
-            wxdata[i] = item.replace("KTG", "G") + "KT"
+            fixed = item.replace("KTG", "G") + "KT"
         # Fix backwards KT Ex: 06012G22TK
         if (
             ilen >= 7
             and (item[:3].isdigit() or item[:3] == "VRB")
             and item.endswith("TK")
         ):
-            wxdata[i] = item[:-2] + "KT"
+            fixed = item[:-2] + "KT"
         # Fix gust double G Ex: 360G17G32KT
         elif ilen > 10 and item.endswith("KT") and item[3] == "G":
-            wxdata[i] = item[:3] + item[4:]
+            fixed = item[:3] + item[4:]
         # Fix leading character mistypes in wind
         elif (
             ilen > 7
@@ -510,15 +847,15 @@ def sanitize_report_list(wxdata: [str], remove_clr_and_skc: bool = True) -> [str
         ):
             while not item[0].isdigit() and item[:3] != "VRB":
                 item = item[1:]
-            wxdata[i] = item
+            fixed = item
         # Fix non-G gust Ex: 14010-15KT
         elif ilen == 10 and item.endswith("KT") and item[5] != "G":
-            wxdata[i] = item[:5] + "G" + item[6:]
+            fixed = item[:5] + "G" + item[6:]
         # Fix leading digits on VRB wind Ex: 2VRB02KT
         elif ilen > 7 and item.endswith("KT") and "VRB" in item and item[0].isdigit():
             while item[0].isdigit():
                 item = item[1:]
-            wxdata[i] = item
+            fixed = item
         # Fix wind T
         elif not item.endswith("KT") and (
             (
@@ -536,62 +873,68 @@ def sanitize_report_list(wxdata: [str], remove_clr_and_skc: bool = True) -> [str
                 and (item[:5].isdigit() or item.startswith("VRB"))
             )
         ):
-            wxdata[i] = item[:-1] + "KT"
+            fixed = item[:-1] + "KT"
         # Fix joined TX-TN
         elif ilen > 16 and len(item.split("/")) == 3:
             if item.startswith("TX") and "TN" not in item:
                 tn_index = item.find("TN")
-                wxdata.insert(i + 1, item[:tn_index])
-                wxdata[i] = item[tn_index:]
+                extra = (item[:tn_index],)
+                fixed = item[tn_index:]
             elif item.startswith("TN") and item.find("TX") != -1:
                 tx_index = item.find("TX")
-                wxdata.insert(i + 1, item[:tx_index])
-                wxdata[i] = item[tx_index:]
+                extra = (item[:tx_index],)
+                fixed = item[tx_index:]
         # Fix situations where a space is missing
         sep = extra_space_needed(item)
         if sep:
-            wxdata.insert(i + 1, item[sep:])
-            wxdata[i] = item[:sep]
-    wxdata = dedupe(wxdata, only_neighbors=True)
-    return wxdata
+            extra = (item[sep:],) + extra
+            fixed = item[:sep]
+        if extra:
+            ret.extend(reversed(extra))
+        ret.append(fixed)
+    ret.reverse()
+    return dedupe(ret, only_neighbors=True)
 
 
 def get_runway_visibility(wxdata: [str]) -> ([str], [str]):
     """
     Returns the report list and the remove runway visibility list
     """
-    runway_vis = []
-    for i, item in reversed(list(enumerate(wxdata))):
-        if (
-            len(item) > 4
-            and item[0] == "R"
-            and (item[3] == "/" or item[4] == "/")
-            and item[1:3].isdigit()
-        ):
-            runway_vis.append(wxdata.pop(i))
+    ret, runway_vis = [], []
+    for item in wxdata:
+        if classify_token(item) & TOKEN_RVR:
+            runway_vis.append(item)
+        else:
+            ret.append(item)
     runway_vis.sort()
-    return wxdata, runway_vis
+    return ret, runway_vis
 
 
 def get_wind_shear(wxdata: [str]) -> ([str], str):
     """
     Returns the report list and the remove wind shear
     """
-    shear = None
-    for i, item in reversed(list(enumerate(wxdata))):
-        if len(item) > 6 and item.startswith("WS") and item[5] == "/":
-            shear = wxdata.pop(i).replace("KT", "")
-    return wxdata, shear
+    ret, shear = [], None
+    for item in wxdata:
+        if classify_token(item) & TOKEN_WIND_SHEAR:
+            # Keep the first if more than one is reported
+            if shear is None:
+                shear = item.replace("KT", "")
+        else:
+            ret.append(item)
+    return ret, shear
 
 
-def get_altimeter(wxdata: [str], units: Units, version: str = "NA") -> ([str], Number):
+def get_altimeter(
+    wxdata: [str], units: Units, version: str = "NA"
+) -> ([str], Number, Units):
     """
-    Returns the report list and the removed altimeter item
+    Returns the report list, the removed altimeter item, and the updated units
 
     Version is 'NA' (North American / default) or 'IN' (International)
     """
     if not wxdata:
-        return wxdata, None
+        return wxdata, None, units
     altimeter = ""
     target = wxdata[-1]
     # Handle QNH prefix:
@@ -609,7 +952,7 @@ def get_altimeter(wxdata: [str], units: Units, version: str = "NA") -> ([str], N
                 wxdata.pop()
                 altimeter = wxdata.pop()[buf:]
             else:
-                units.altimeter = "hPa"
+                units = change_units(units, altimeter="hPa")
                 altimeter = wxdata.pop()[buf:].lstrip(".")
         # Else grab the digits
         elif len(target) == 4 and target.isdigit():
@@ -626,7 +969,7 @@ def get_altimeter(wxdata: [str], units: Units, version: str = "NA") -> ([str], N
                 wxdata.pop()
                 altimeter = wxdata.pop()[buf:]
             else:
-                units.altimeter = "inHg"
+                units = change_units(units, altimeter="inHg")
                 altimeter = wxdata.pop()[buf:]
     # Some stations report both, but we only need one
     if wxdata and (wxdata[-1][0] == "A" or wxdata[-1][0] == "Q"):
@@ -634,12 +977,12 @@ def get_altimeter(wxdata: [str], units: Units, version: str = "NA") -> ([str], N
     # convert to Number
     altimeter = altimeter.replace("/", "").strip("AQ")
     if not altimeter:
-        return wxdata, None
+        return wxdata, None, units
     if units.altimeter == "inHg":
         value = altimeter[:2] + "." + altimeter[2:]
     else:
         value = altimeter
-    return wxdata, make_number(value, altimeter)
+    return wxdata, make_number(value, altimeter), units
 
 
 def get_taf_alt_ice_turb(wxdata: [str]) -> ([str], str, [str], [str]):
@@ -647,19 +990,22 @@ def get_taf_alt_ice_turb(wxdata: [str]) -> ([str], str, [str], [str]):
     Returns the report list and removed: Altimeter string, Icing list, Turbulence list
     """
     altimeter = ""
-    icing, turbulence = [], []
-    for i, item in reversed(list(enumerate(wxdata))):
-        if len(item) > 6 and item.startswith("QNH") and item[3:7].isdigit():
-            altimeter = wxdata.pop(i)[3:7]
+    ret, icing, turbulence = [], [], []
+    for item in reversed(wxdata):
+        tags = classify_token(item)
+        if tags & TOKEN_ALTIMETER and item.startswith("QNH"):
+            altimeter = item[3:7]
             if altimeter[0] in ("2", "3"):
                 altimeter = altimeter[:2] + "." + altimeter[2:]
             altimeter = make_number(altimeter)
-        elif item.isdigit():
-            if item[0] == "6":
-                icing.append(wxdata.pop(i))
-            elif item[0] == "5":
-                turbulence.append(wxdata.pop(i))
-    return wxdata, altimeter, icing, turbulence
+        elif tags & TOKEN_ICING:
+            icing.append(intern_token(item))
+        elif tags & TOKEN_TURBULENCE:
+            turbulence.append(intern_token(item))
+        else:
+            ret.append(intern_token(item))
+    ret.reverse()
+    return ret, altimeter, icing, turbulence
 
 
 def is_possible_temp(temp: str) -> bool:
@@ -676,28 +1022,13 @@ def get_temp_and_dew(wxdata: str) -> ([str], Number, Number):
     """
     Returns the report list and removed temperature and dewpoint strings
     """
-    for i, item in reversed(list(enumerate(wxdata))):
-        if "/" in item:
-            # ///07
-            if item[0] == "/":
-                item = "/" + item.lstrip("/")
-            # 07///
-            elif item[-1] == "/":
-                item = item.rstrip("/") + "/"
-            tempdew = item.split("/")
-            if len(tempdew) != 2:
-                continue
-            valid = True
-            for j, temp in enumerate(tempdew):
-                if temp in ["MM", "XX"]:
-                    tempdew[j] = ""
-                elif not is_possible_temp(temp):
-                    valid = False
-                    break
-            if valid:
-                wxdata.pop(i)
-                return (wxdata, *[make_number(t) for t in tempdew])
-    return wxdata, None, None
+    temperature, dewpoint = None, None
+    for i in range(len(wxdata) - 1, -1, -1):
+        if classify_token(wxdata[i]) & TOKEN_TEMP_DEW:
+            tempdew = _split_temp_dew(wxdata.pop(i))
+            temperature, dewpoint = [make_number(t) for t in tempdew]
+            break
+    return [intern_token(item) for item in wxdata], temperature, dewpoint
 
 
 def get_station_and_time(wxdata: [str]) -> ([str], str, str):
@@ -706,7 +1037,7 @@ def get_station_and_time(wxdata: [str]) -> ([str], str, str):
     """
     if not wxdata:
         return wxdata, None, None
-    station = wxdata.pop(0)
+    station = intern_token(wxdata.pop(0))
     if not wxdata:
         return wxdata, station, None
     qtime = wxdata[0]
@@ -719,116 +1050,81 @@ def get_station_and_time(wxdata: [str]) -> ([str], str, str):
     return wxdata, station, rtime
 
 
-def get_wind(wxdata: [str], units: Units) -> ([str], Number, Number, Number, [Number]):
+def get_wind(
+    wxdata: [str], units: Units
+) -> ([str], Number, Number, Number, [Number], Units):
     """
     Returns the report list and removed:
     Direction string, speed string, gust string, variable direction list
+
+    Also returns the units updated with the reported wind speed unit
     """
     direction, speed, gust = "", "", ""
     variable = []
-    if wxdata:
-        item = copy(wxdata[0])
-        for rep in ["(E)"]:
-            item = item.replace(rep, "")
-        for replacements in (("O", "0"), ("/", ""), ("LKT", "KT"), ("GG", "G")):
-            item = item.replace(*replacements)
-        # 09010KT, 09010G15KT
-        if (
-            item.endswith("KT")
-            or item.endswith("KTS")
-            or item.endswith("MPS")
-            or item.endswith("KMH")
-            or (
-                (
-                    len(item) == 5
-                    or (len(item) >= 8 and item.find("G") != -1)
-                    and item.find("/") == -1
-                )
-                and (
-                    item[:5].isdigit()
-                    or (item.startswith("VRB") and item[3:5].isdigit())
-                )
-            )
-        ):
-            # In order of frequency
-            if item.endswith("KT"):
-                item = item.replace("KT", "")
-            elif item.endswith("KTS"):
-                item = item.replace("KTS", "")
-            elif item.endswith("MPS"):
-                units.wind_speed = "m/s"
-                item = item.replace("MPS", "")
-            elif item.endswith("KMH"):
-                units.wind_speed = "km/h"
-                item = item.replace("KMH", "")
-            direction = item[:3]
-            if "G" in item:
-                g_index = item.find("G")
-                gust = item[g_index + 1 :]
-                speed = item[3:g_index]
-            else:
-                speed = item[3:]
-            direction = item[:3]
-            wxdata.pop(0)
+    # 09010KT, 09010G15KT
+    if wxdata and classify_token(wxdata[0]) & TOKEN_WIND:
+        item = _clean_wind(wxdata[0])
+        # In order of frequency
+        if item.endswith("KT"):
+            item = item.replace("KT", "")
+        elif item.endswith("KTS"):
+            item = item.replace("KTS", "")
+        elif item.endswith("MPS"):
+            units = change_units(units, wind_speed="m/s")
+            item = item.replace("MPS", "")
+        elif item.endswith("KMH"):
+            units = change_units(units, wind_speed="km/h")
+            item = item.replace("KMH", "")
+        if "G" in item:
+            g_index = item.find("G")
+            gust = item[g_index + 1 :]
+            speed = item[3:g_index]
+        else:
+            speed = item[3:]
+        direction = item[:3]
+        wxdata.pop(0)
     # Separated Gust
-    if (
-        wxdata
-        and 1 < len(wxdata[0]) < 4
-        and wxdata[0][0] == "G"
-        and wxdata[0][1:].isdigit()
-    ):
+    if wxdata and classify_token(wxdata[0]) & TOKEN_GUST:
         gust = wxdata.pop(0)[1:]
     # Variable Wind Direction
-    if (
-        wxdata
-        and len(wxdata[0]) == 7
-        and wxdata[0][:3].isdigit()
-        and wxdata[0][3] == "V"
-        and wxdata[0][4:].isdigit()
-    ):
+    if wxdata and classify_token(wxdata[0]) & TOKEN_VARIABLE_WIND:
         variable = [make_number(i, speak=i) for i in wxdata.pop(0).split("V")]
     # Convert to Number
     direction = make_number(direction, speak=direction)
     speed = make_number(speed.strip("BV"))
     gust = make_number(gust)
-    return wxdata, direction, speed, gust, variable
+    return wxdata, direction, speed, gust, variable, units
 
 
-def get_visibility(wxdata: [str], units: Units) -> ([str], Number):
+def get_visibility(wxdata: [str], units: Units) -> ([str], Number, Units):
     """
     Returns the report list and removed visibility string
+
+    Also returns the units updated with the reported visibility unit
     """
     visibility = ""
     if wxdata:
-        item = copy(wxdata[0])
-        # Vis reported in statue miles
-        if item.endswith("SM"):  # 10SM
-            if item in ("P6SM", "M1/4SM", "M1/8SM"):
-                visibility = item[:-2]
-            elif item[:-2].isdigit():
-                visibility = str(int(item[:-2]))
-            elif "/" in item:
-                visibility = item[: item.find("SM")]  # 1/2SM
-            wxdata.pop(0)
-            units.visibility = "sm"
-        # Vis reported in meters
-        elif len(item) == 4 and item.isdigit():
-            visibility = wxdata.pop(0)
-            units.visibility = "m"
-        elif (
-            7 >= len(item) >= 5
-            and item[:4].isdigit()
-            and (item[4] in ["M", "N", "S", "E", "W"] or item[4:] == "NDV")
-        ):
-            visibility = wxdata.pop(0)[:4]
-            units.visibility = "m"
-        elif len(item) == 5 and item[1:].isdigit() and item[0] in ["M", "P", "B"]:
-            visibility = wxdata.pop(0)[1:]
-            units.visibility = "m"
-        elif item.endswith("KM") and item[:-2].isdigit():
-            visibility = item[:-2] + "000"
+        item = wxdata[0]
+        if classify_token(item) & TOKEN_VISIBILITY:
             wxdata.pop(0)
-            units.visibility = "m"
+            # Vis reported in statue miles
+            if item.endswith("SM"):  # 10SM
+                if item in ("P6SM", "M1/4SM", "M1/8SM"):
+                    visibility = item[:-2]
+                elif item[:-2].isdigit():
+                    visibility = str(int(item[:-2]))
+                elif "/" in item:
+                    visibility = item[: item.find("SM")]  # 1/2SM
+                units = change_units(units, visibility="sm")
+            # Vis reported in meters
+            else:
+                if item.endswith("KM"):
+                    visibility = item[:-2] + "000"
+                elif item[0] in ("M", "P", "B"):
+                    visibility = item[1:]
+                else:
+                    visibility = item[:4]
+                units = change_units(units, visibility="m")
         # Vis statute miles but split Ex: 2 1/2SM
         elif (
             len(wxdata) > 1
@@ -839,8 +1135,8 @@ def get_visibility(wxdata: [str], units: Units) -> ([str], Number):
             vis1 = wxdata.pop(0)  # 2
             vis2 = wxdata.pop(0).replace("SM", "")  # 1/2
             visibility = str(int(vis1) * int(vis2[2]) + int(vis2[0])) + vis2[1:]  # 5/2
-            units.visibility = "sm"
-    return wxdata, make_number(visibility)
+            units = change_units(units, visibility="sm")
+    return wxdata, make_number(visibility), units
 
 
 def starts_new_line(item: str) -> bool:
@@ -887,12 +1183,7 @@ def get_type_and_times(wxdata: [str]) -> ([str], str, str, str):
             report_type = wxdata.pop(0)
     if wxdata:
         # 1200/1306
-        if (
-            len(wxdata[0]) == 9
-            and wxdata[0][4] == "/"
-            and wxdata[0][:4].isdigit()
-            and wxdata[0][5:].isdigit()
-        ):
+        if classify_token(wxdata[0]) & TOKEN_TIMERANGE:
             start_time, end_time = wxdata.pop(0).split("/")
         # FM120000
         elif len(wxdata[0]) > 7 and wxdata[0].startswith("FM"):
@@ -913,7 +1204,7 @@ def get_type_and_times(wxdata: [str]) -> ([str], str, str, str):
                 and wxdata[0][2:8].isdigit()
             ):
                 end_time = wxdata.pop(0)[2:6]
-    return wxdata, report_type, start_time, end_time
+    return wxdata, intern_token(report_type), start_time, end_time
 
 
 def _is_tempo_or_prob(line: dict) -> bool:
@@ -966,14 +1257,15 @@ def get_temp_min_and_max(wxlist: [str]) -> ([str], str, str):
     Pull out Max temp at time and Min temp at time items from wx list
     """
     temp_max, temp_min = "", ""
-    for i, item in reversed(list(enumerate(wxlist))):
-        if len(item) > 6 and item[0] == "T" and "/" in item:
+    ret = []
+    for item in reversed(wxlist):
+        if classify_token(item) & TOKEN_TEMP_MIN_MAX:
             # TX12/1316Z
             if item[1] == "X":
-                temp_max = wxlist.pop(i)
+                temp_max = item
             # TNM03/1404Z
             elif item[1] == "N":
-                temp_min = wxlist.pop(i)
+                temp_min = item
             # TM03/1404Z T12/1316Z -> Will fix TN/TX
             elif item[1] == "M" or item[1].isdigit():
                 if temp_min:
@@ -986,8 +1278,12 @@ def get_temp_min_and_max(wxlist: [str]) -> ([str], str, str):
                         temp_max = "TX" + item[1:]
                 else:
                     temp_min = "TN" + item[1:]
-                wxlist.pop(i)
-    return wxlist, temp_max, temp_min
+            else:
+                ret.append(item)
+        else:
+            ret.append(item)
+    ret.reverse()
+    return ret, temp_max, temp_min
 
 
 def _get_digit_list(alist: [str], from_index: int) -> ([str], [str]):
@@ -1033,6 +1329,15 @@ def make_cloud(cloud: str) -> Cloud:
     Returns a Cloud dataclass for a cloud string
 
     This function assumes the input is potentially valid
+
+    Results are cached and shared. See CLOUD_CACHE
+    """
+    return CLOUD_CACHE(cloud)
+
+
+def _make_cloud(cloud: str) -> Cloud:
+    """
+    Builds a new Cloud for make_cloud
     """
     els = {"type": None, "base": None, "top": None, "modifier": None}
     _c = sanitize_cloud(cloud).replace("/", "")
@@ -1067,25 +1372,33 @@ def make_cloud(cloud: str) -> Cloud:
             els[k] = None
         elif v.isdigit():
             els[k] = int(v)
+        else:
+            els[k] = intern_token(v)
     # Make Cloud
     return Cloud(cloud, **els)
 
 
+#: Cache of Cloud results shared by make_cloud
+CLOUD_CACHE = StructCache(_make_cloud)
+
+
 def get_clouds(wxdata: [str]) -> ([str], list):
     """
     Returns the report list and removed list of split cloud layers
     """
-    clouds = []
-    for i, item in reversed(list(enumerate(wxdata))):
-        if item[:3] in CLOUD_LIST or item[:2] == "VV":
-            cloud = wxdata.pop(i)
-            clouds.append(make_cloud(cloud))
+    ret, clouds = [], []
+    for item in reversed(wxdata):
+        if classify_token(item) & TOKEN_CLOUD:
+            clouds.append(make_cloud(item))
+        else:
+            ret.append(item)
+    ret.reverse()
     # Attempt cloud sort. Fails if None values are present
     try:
         clouds.sort(key=lambda cloud: (cloud.base, cloud.type))
     except TypeError:
         clouds.reverse()  # Restores original report order
-    return wxdata, clouds
+    return ret, clouds
 
 
 def get_flight_rules(vis: Number, ceiling: Cloud) -> int:
@@ -1160,15 +1473,45 @@ def get_ceiling(clouds: [Cloud]) -> Cloud:
     return None
 
 
+def _as_utc(issued: "date/datetime") -> datetime:
+    """
+    Returns a UTC datetime for an issued date or datetime. Dates start at midnight
+    """
+    if not isinstance(issued, datetime):
+        return datetime(issued.year, issued.month, issued.day, tzinfo=timezone.utc)
+    if issued.tzinfo is None:
+        return issued.replace(tzinfo=timezone.utc)
+    return issued.astimezone(timezone.utc)
+
+
 def parse_date(
-    date: str, hour_threshold: int = 200, time_only: bool = False
+    date: str,
+    hour_threshold: int = 200,
+    time_only: bool = False,
+    issued: "date/datetime" = None,
 ) -> datetime:
     """
     Parses a report timestamp in ddhhZ or ddhhmmZ format
 
-    If time_only, assumes hhmm format with current or previous day
+    If time_only, assumes hhmm format with the issued or previous day
 
-    This function assumes the given timestamp is within the hour threshold from current date
+    This function assumes the given timestamp is within the hour threshold from the
+    issued date or datetime. The current time is used if not given
+
+    Results are cached for a given issued value, so a timestamp repeated across a
+    batch sharing that value is only resolved once
+    """
+    if issued is None:
+        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+        return _parse_date(date, hour_threshold, time_only, now)
+    return _cached_parse_date(date, hour_threshold, time_only, _as_utc(issued))
+
+
+def _parse_date(
+    date: str, hour_threshold: int, time_only: bool, now: datetime
+) -> datetime:
+    """
+    Resolves a report timestamp against a reference UTC datetime for parse_date
     """
     # Format date string
     date = date.strip("Z")
@@ -1185,7 +1528,6 @@ def parse_date(
             return
         ihour = 2
     # Create initial guess
-    now = datetime.utcnow().replace(tzinfo=timezone.utc)
     day = now.day if time_only else int(date[0:2])
     # Handle situation where next month has less days than current month
     # Shifted value makes sure that a month shift doesn't happen twice
@@ -1213,9 +1555,93 @@ def parse_date(
     return guess
 
 
-def make_timestamp(timestamp: str, time_only: bool = False) -> Timestamp:
+_cached_parse_date = lru_cache(maxsize=1024)(_parse_date)
+
+
+def make_timestamp(
+    timestamp: str, time_only: bool = False, issued: "date/datetime" = None
+) -> Timestamp:
     """
     Returns a Timestamp dataclass for a report timestamp in ddhhZ or ddhhmmZ format
     """
     if timestamp:
-        return Timestamp(timestamp, parse_date(timestamp, time_only=time_only))
+        date_obj = parse_date(timestamp, time_only=time_only, issued=issued)
+        return Timestamp(timestamp, date_obj)
+
+
+def struct_fields(struct: type) -> [str]:
+    """
+    Returns the field names of a report dataclass
+    """
+    return [field.name for field in dataclasses.fields(struct)]
+
+
+def frozen(fields: {str}) -> "frozenset":
+    """
+    Returns a hashable copy of a requested fields set or None
+    """
+    return None if fields is None else frozenset(fields)
+
+
+def check_fields(fields: {str}, known: [str]):
+    """
+    Raises a ValueError if any requested field is not a known field name
+    """
+    unknown = set(fields).difference(known)
+    if unknown:
+        raise ValueError("Unknown report fields: " + ", ".join(sorted(unknown)))
+
+
+def project_fields(names: [str], values: dict, fields: {str} = None) -> dict:
+    """
+    Returns the values for each field name. Fields not in a given fields set are None
+    """
+    if fields is None:
+        return {name: values.get(name) for name in names}
+    return {name: values.get(name) if name in fields else None for name in names}
+
+
+def _safe_parse(parser: "Callable", item: (str, str, datetime)) -> "tuple/Exception":
+    """
+    Runs a report parser on a station, report, issued item
+
+    Returns the exception instead of raising it so one bad report doesn't end a batch
+    """
+    try:
+        return parser(*item)
+    except Exception as exc:  # pylint: disable=broad-except
+        return exc
+
+
+def parse_many(
+    parser: "Callable",
+    items: [(str, str)],
+    workers: int = None,
+    chunksize: int = None,
+    use_threads: bool = False,
+    issued: "date/datetime" = None,
+) -> ["tuple/Exception"]:
+    """
+    Runs a report parser over many station, report pairs using a worker pool
+
+    Items may also be station, report, issued tuples. Pairs are given the issued
+    value or, if not set, the time the batch started. Sharing one reference time
+    lets repeated report timestamps be resolved once per batch
+
+    Results are returned in the same order as the given items. Any exception raised
+    while parsing an item is returned in that item's place
+
+    Parsing is CPU-bound, so a process pool is used unless use_threads is True
+    """
+    issued = issued or datetime.now(tz=timezone.utc)
+    items = [item if len(item) > 2 else (*item, issued) for item in items]
+    func = partial(_safe_parse, parser)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(items) < 2:
+        return [func(item) for item in items]
+    if not chunksize:
+        # Roughly four chunks per worker balances IPC overhead and stragglers
+        chunksize = max(1, len(items) // (workers * 4))
+    pool = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with pool(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
@@ -0,0 +1,227 @@
+"""
+Streaming ingestion of archived METAR files
+
+Archives are read in chunks of records which are parsed across a worker pool. Each
+record is parsed with its own archive timestamp as the reference time. Results are
+appended to a JSON Lines file, and progress is saved to a checkpoint after every
+chunk so an interrupted run can resume where it stopped
+"""
+
+# stdlib
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
+from pathlib import Path
+
+# module
+from avwx import _core, metar
+
+#: Default timestamp format for each archive format
+TIME_FORMATS = {"csv": "%Y-%m-%d %H:%M", "text": "%Y/%m/%d %H:%M"}
+
+# Report type prefixes found before the station in some archives
+_PREFIXES = ("METAR", "SPECI")
+
+
+def _parse_time(value: str, time_format: str) -> datetime:
+    """
+    Returns a UTC datetime from an archive timestamp or None if it doesn't match
+    """
+    try:
+        return datetime.strptime(value.strip(), time_format).replace(
+            tzinfo=timezone.utc
+        )
+    except ValueError:
+        return None
+
+
+def _station(report: str) -> str:
+    """
+    Returns the station ident from the start of a report
+    """
+    items = report.split(maxsplit=2)
+    if len(items) > 1 and items[0] in _PREFIXES:
+        return items[1]
+    return items[0]
+
+
+def read_records(
+    path: str,
+    fmt: str = None,
+    offset: int = 0,
+    time_format: str = None,
+    station_column: str = None,
+    report_column: str = "metar",
+    time_column: str = "valid",
+    last_issued: datetime = None,
+) -> "Iterator":
+    """
+    Yields station, report, issued records and the byte offset after each one
+
+    The format is "csv" or "text" and defaults to "csv" for .csv files. CSV archives
+    need a header row. Without a station column, the station is read from the report.
+    Text archives have one report per line, and a line with only a timestamp sets
+    the issued time of the reports after it. Issued is None if no time is known
+
+    Start reading from an offset returned by an earlier record to resume. When
+    resuming inside a text archive block, pass that record's issued time as
+    last_issued so the reports after it keep the block's timestamp
+    """
+    if fmt is None:
+        fmt = "csv" if Path(path).suffix.lower() == ".csv" else "text"
+    if fmt not in TIME_FORMATS:
+        raise ValueError(f"{fmt} is not a supported archive format")
+    time_format = time_format or TIME_FORMATS[fmt]
+    with open(path, "rb") as stream:
+        if fmt == "csv":
+            header = next(csv.reader([stream.readline().decode()]), [])
+            columns = {name.strip(): i for i, name in enumerate(header)}
+            try:
+                report_index = columns[report_column]
+                time_index = columns.get(time_column)
+                station_index = columns[station_column] if station_column else None
+            except KeyError as exc:
+                raise ValueError(f"Archive has no {exc.args[0]} column") from None
+        offset = max(offset, stream.tell())
+        stream.seek(offset)
+        issued = last_issued
+        for line in stream:
+            offset += len(line)
+            line = line.decode().strip()
+            if not line:
+                continue
+            if fmt == "csv":
+                row = next(csv.reader([line]))
+                report = row[report_index].strip()
+                if not report:
+                    continue
+                if time_index is not None:
+                    issued = _parse_time(row[time_index], time_format)
+                station = row[station_index] if station_index is not None else None
+            else:
+                # Station idents don't start with a digit but timestamp lines do
+                if line[0].isdigit():
+                    when = _parse_time(line, time_format)
+                    if when:
+                        issued = when
+                        continue
+                report, station = line, None
+            yield (station or _station(report), report, issued), offset
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Returns the progress saved in a checkpoint file or None if it doesn't exist
+    """
+    try:
+        with open(path) as stream:
+            return json.load(stream)
+    except FileNotFoundError:
+        return None
+
+
+def _save_checkpoint(path: str, state: dict):
+    """
+    Replaces a checkpoint file so a crash never leaves it partly written
+    """
+    temp = f"{path}.tmp"
+    with open(temp, "w") as stream:
+        json.dump(state, stream)
+        stream.flush()
+        os.fsync(stream.fileno())
+    os.replace(temp, path)
+
+
+def _chunks(records: "Iterator", size: int) -> "Iterator":
+    """
+    Yields lists of records and the byte offset after the last one
+    """
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield [record for record, _ in chunk], chunk[-1][1]
+
+
+def _format_line(result: tuple) -> bytes:
+    """
+    Returns a parse result as a JSON Lines entry
+    """
+    data, units = result
+    return f'{{"data": {data.to_json()}, "units": {units.to_json()}}}\n'.encode()
+
+
+def ingest(
+    source: str,
+    output: str,
+    checkpoint: str = None,
+    chunk_size: int = 10000,
+    workers: int = None,
+    use_threads: bool = False,
+    issued: "date/datetime" = None,
+    fields: {str} = None,
+    **read_options,
+) -> {str: object}:
+    """
+    Parses a METAR archive file into a JSON Lines file of data and units dicts
+
+    Records without an archive timestamp use issued or the time the run started.
+    Reports which fail to parse are counted and skipped. Extra keyword arguments are
+    passed to read_records
+
+    If a checkpoint path is given, progress is saved after every chunk. Running again
+    with the same checkpoint resumes after the last saved chunk and drops output
+    written after it. Without one, the output file is replaced
+
+    Returns the final progress with the parsed and failed counts and the issued time
+    of the last record read, which resuming needs inside a text archive block
+    """
+    state = {
+        "source": str(source),
+        "offset": 0,
+        "size": 0,
+        "parsed": 0,
+        "failed": 0,
+        "issued": None,
+    }
+    saved = load_checkpoint(checkpoint) if checkpoint else None
+    if saved:
+        if saved.get("source") != state["source"]:
+            raise ValueError(f"Checkpoint was made for {saved.get('source')}")
+        state.update(saved)
+    issued = issued or datetime.now(tz=timezone.utc)
+    parser = partial(metar.parse, fields=fields) if fields is not None else metar.parse
+    func = partial(_core._safe_parse, parser)
+    workers = workers or os.cpu_count() or 1
+    last_issued = state["issued"] and datetime.fromisoformat(state["issued"])
+    records = read_records(
+        source, offset=state["offset"], last_issued=last_issued, **read_options
+    )
+    pool = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with open(output, "ab") as stream, pool(max_workers=workers) as executor:
+        # Drop anything written after the last checkpoint
+        stream.truncate(state["size"])
+        for chunk, offset in _chunks(records, chunk_size):
+            items = [item if item[2] else (*item[:2], issued) for item in chunk]
+            if workers == 1:
+                results = map(func, items)
+            else:
+                chunksize = max(1, len(items) // (workers * 4))
+                results = executor.map(func, items, chunksize=chunksize)
+            for result in results:
+                if isinstance(result, Exception):
+                    state["failed"] += 1
+                else:
+                    stream.write(_format_line(result))
+                    state["parsed"] += 1
+            stream.flush()
+            state["offset"], state["size"] = offset, stream.tell()
+            last_issued = chunk[-1][2]
+            state["issued"] = last_issued and last_issued.isoformat()
+            if checkpoint:
+                _save_checkpoint(checkpoint, state)
+    return state
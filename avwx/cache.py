@@ -0,0 +1,214 @@
+"""
+Opt-in caching of parse and translation results keyed on the raw report
+
+Caching is off until a backend is set with set_backend
+"""
+
+# stdlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import astuple
+from datetime import datetime
+from functools import lru_cache, wraps
+from threading import Lock
+
+# module
+from avwx import _core
+
+
+class CacheBackend(ABC):
+    """
+    Interface for a parse result store
+
+    Subclass this to slot in a store shared between processes. Keys are tuples of
+    strings and values are picklable report structs
+    """
+
+    @abstractmethod
+    def get(self, key: tuple) -> object:
+        """
+        Returns the stored value for a key or None if not found
+        """
+
+    @abstractmethod
+    def set(self, key: tuple, value: object):
+        """
+        Stores a value for a key
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Removes all stored values
+        """
+
+
+class MemoryCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with optional expiration in seconds
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: tuple) -> object:
+        """
+        Returns the stored value for a key or None if not found or expired
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires = item
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: tuple, value: object):
+        """
+        Stores a value for a key, removing the least recently used if full
+        """
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all stored values and resets the stats
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits, self.misses = 0, 0
+
+    def info(self) -> {str: object}:
+        """
+        Returns the cache hits, misses, current size, max size, and hit rate
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_SETTINGS = {"backend": None}
+
+
+def set_backend(backend: CacheBackend):
+    """
+    Sets the store used for parse and translation results. None disables caching
+    """
+    _SETTINGS["backend"] = backend
+
+
+def get_backend() -> CacheBackend:
+    """
+    Returns the current cache backend or None if caching is disabled
+    """
+    return _SETTINGS["backend"]
+
+
+def _reference_day(issued: "date/datetime") -> str:
+    """
+    Returns the ISO UTC date a report timestamp is resolved against
+    """
+    if issued is None:
+        return datetime.utcnow().date().isoformat()
+    if isinstance(issued, datetime):
+        return _core._as_utc(issued).date().isoformat()
+    return issued.isoformat()
+
+
+def cached_parse(kind: str) -> "Callable":
+    """
+    Decorates a report parser to cache results by station, raw report, reference day,
+    and requested fields
+
+    Cached results are shared between callers and should not be modified
+    """
+
+    def decorator(func: "Callable") -> "Callable":
+        @wraps(func)
+        def wrapper(
+            station: str, report: str, issued: "date/datetime" = None, fields=None
+        ) -> tuple:
+            backend = _SETTINGS["backend"]
+            if backend is None or not report:
+                return func(station, report, issued, fields)
+            fields_key = None if fields is None else tuple(sorted(fields))
+            key = (kind, station, report, _reference_day(issued), fields_key)
+            value = backend.get(key)
+            if value is None:
+                value = func(station, report, issued, fields)
+                backend.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def _field_names(struct: type) -> tuple:
+    """
+    Returns the field names of a report struct
+    """
+    return tuple(_core.struct_fields(struct))
+
+
+def _empty_fields(wxdata: "ReportData") -> tuple:
+    """
+    Returns the names of the fields without a value in data and its forecast lines
+
+    Parses with fields leave every other field empty, so this tells a projected
+    parse apart from a full parse of the same report
+    """
+    empty = tuple(
+        name for name in _field_names(type(wxdata)) if getattr(wxdata, name) is None
+    )
+    lines = getattr(wxdata, "forecast", None)
+    if lines:
+        return empty, tuple(_empty_fields(line) for line in lines)
+    return empty
+
+
+def cached_translation(kind: str) -> "Callable":
+    """
+    Decorates a report translator to cache results by station, raw report, units,
+    and the fields without a value
+
+    Data without its raw report, like a parse without the raw field, is not cached
+    """
+
+    def decorator(func: "Callable") -> "Callable":
+        @wraps(func)
+        def wrapper(wxdata: "ReportData", units: "Units") -> object:
+            backend = _SETTINGS["backend"]
+            if backend is None or wxdata is None or not wxdata.raw:
+                return func(wxdata, units)
+            empty = _empty_fields(wxdata)
+            key = (kind, wxdata.station, wxdata.raw, astuple(units), empty)
+            value = backend.get(key)
+            if value is None:
+                value = func(wxdata, units)
+                backend.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
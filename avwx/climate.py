@@ -0,0 +1,144 @@
+"""
+Station climatology from columns of parsed METAR data
+
+Functions take rows from metar.parse_columns or history.HistoryStore, which can
+span many stations and years, and group them by station with NumPy instead of
+iterating over reports. Each returns the sorted station idents and an array with
+one entry per station
+"""
+
+# module
+from avwx.static import FLIGHT_RULES
+
+# We catch this import error only if user attempts to use climatology
+try:
+    import numpy
+except ModuleNotFoundError:
+    pass
+
+
+def _groups(data: "numpy.ma.MaskedArray") -> ([str], "numpy.ndarray"):
+    """
+    Returns the unique stations and the station index of each row
+    """
+    try:
+        data = numpy.ma.asarray(data)
+    except NameError:
+        raise ModuleNotFoundError("NumPy must be installed to use climatology")
+    idents = numpy.ascontiguousarray(data["station"].filled(""), dtype="U4")
+    chars = idents.view(numpy.uint32).reshape(-1, 4)
+    if chars.max(initial=0) > 0xFF:
+        keys, codes = numpy.unique(idents, return_inverse=True)
+        return keys.tolist(), codes.ravel()
+    # Sorting idents packed into integers is much faster than sorting strings
+    packed = chars.astype(numpy.uint32) << numpy.array([24, 16, 8, 0], numpy.uint32)
+    _, first, codes = numpy.unique(
+        numpy.bitwise_or.reduce(packed, axis=1), return_index=True, return_inverse=True
+    )
+    return idents[first].tolist(), codes.ravel()
+
+
+def _valid(data: "numpy.ma.MaskedArray", *columns: str) -> "numpy.ndarray":
+    """
+    Returns which rows have a value in every column
+    """
+    valid = ~numpy.ma.getmaskarray(data["station"])
+    for column in columns:
+        valid &= ~numpy.ma.getmaskarray(data[column])
+    return valid
+
+
+def _fractions(counts: "numpy.ndarray") -> "numpy.ndarray":
+    """
+    Returns counts divided by their total over the last axis. Empty totals are NaN
+    """
+    total = counts.sum(axis=-1, keepdims=True)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        return counts / total
+
+
+def flight_rule_frequency(data: "numpy.ma.MaskedArray") -> ([str], "numpy.ndarray"):
+    """
+    Returns the fraction of reports in each flight rule by station, month, and hour
+
+    The array shape is (stations, 12, 24, 4). Month and hour are zero-indexed and
+    flight rules are in static.FLIGHT_RULES order. Cells without reports are NaN
+    """
+    stations, codes = _groups(data)
+    valid = _valid(data, "time", "flight_rules")
+    times = data["time"].data[valid]
+    months = times.astype("datetime64[M]").astype(int) % 12
+    hours = times.astype("datetime64[m]").view("i8") // 60 % 24
+    rules = len(FLIGHT_RULES)
+    index = codes[valid] * 12 + months
+    index = (index * 24 + hours) * rules + data["flight_rules"].data[valid]
+    counts = numpy.bincount(index, minlength=len(stations) * 12 * 24 * rules)
+    return stations, _fractions(counts.reshape(len(stations), 12, 24, rules))
+
+
+def wind_rose(
+    data: "numpy.ma.MaskedArray",
+    sectors: int = 16,
+    speeds: [float] = (1, 5, 10, 15, 20, 25),
+) -> ([str], "numpy.ndarray", "numpy.ndarray"):
+    """
+    Returns the fraction of wind reports by station, direction sector, and speed
+
+    Sectors are centered on north and go clockwise. Speed bins are in knots and start
+    at each speed, so the last bin has every speed above it. Winds slower than the
+    first speed are calm and variable winds are ignored
+
+    Returns stations, the rose array of shape (stations, sectors, speeds), and the
+    calm fraction of each station. Fractions are of all wind reports for the station
+    """
+    stations, codes = _groups(data)
+    valid = _valid(data, "wind_direction", "wind_speed")
+    codes = codes[valid]
+    direction = data["wind_direction"].data[valid]
+    speed = data["wind_speed"].data[valid]
+    width = 360 / sectors
+    sector = ((direction + width / 2) // width).astype(int) % sectors
+    bins = numpy.digitize(speed, speeds) - 1
+    calm = bins < 0
+    index = (codes[~calm] * sectors + sector[~calm]) * len(speeds) + bins[~calm]
+    size = len(stations) * sectors * len(speeds)
+    counts = numpy.bincount(index, minlength=size).reshape(len(stations), -1)
+    calms = numpy.bincount(codes[calm], minlength=len(stations))
+    totals = _fractions(numpy.column_stack((counts, calms)))
+    rose = totals[:, :-1].reshape(len(stations), sectors, len(speeds))
+    return stations, rose, totals[:, -1]
+
+
+def percentiles(
+    data: "numpy.ma.MaskedArray", column: str, q: [float] = (10, 25, 50, 75, 90)
+) -> ([str], "numpy.ndarray"):
+    """
+    Returns percentiles of a column like ceiling or visibility for each station
+
+    Percentiles are linearly interpolated like numpy.percentile. Masked values, like
+    reports without a ceiling, are ignored. Stations without values are NaN
+
+    The array shape is (stations, len(q))
+    """
+    stations, codes = _groups(data)
+    valid = _valid(data, column)
+    codes = codes[valid]
+    values = data[column].data[valid].astype(float)
+    # Sort by value then stable sort by station so each station's values are one
+    # sorted run. Stable sorts of 16-bit ints use a radix sort
+    order = numpy.argsort(values)
+    keys = codes[order]
+    if len(stations) <= 1 << 16:
+        keys = keys.astype(numpy.uint16)
+    order = order[numpy.argsort(keys, kind="stable")]
+    codes, values = codes[order], values[order]
+    counts = numpy.bincount(codes, minlength=len(stations))
+    starts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+    ranks = (counts[:, None] - 1) * (numpy.asarray(q, dtype=float) / 100)
+    lower = numpy.floor(ranks).astype(int)
+    upper = numpy.minimum(lower + 1, numpy.maximum(counts[:, None] - 1, 0))
+    empty = counts == 0
+    values = numpy.append(values, numpy.nan)
+    low = values[numpy.where(empty[:, None], -1, starts[:, None] + lower)]
+    high = values[numpy.where(empty[:, None], -1, starts[:, None] + upper)]
+    return stations, low + (high - low) * (ranks - lower)
@@ -0,0 +1,243 @@
+"""
+Compact binary encoding of report structs for caches and inter-process messages
+
+Structs are flattened into tuples of their field values, serialized with marshal,
+and compressed. Encoded values start with a format version. Decoding data written
+with another version raises a ValueError, so stored values should be dropped and
+rebuilt
+"""
+
+# stdlib
+import marshal
+import zlib
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import attrgetter
+
+# module
+from avwx import _core, structs
+
+#: Format version written at the start of every encoded value
+VERSION = 1
+
+_MAGIC = b"AV"
+_COMPRESSED = 1
+# marshal format version 4 is readable by every supported Python version
+_MARSHAL_VERSION = 4
+
+# Values which marshal stores as-is
+_PLAIN = frozenset((str, int, float, bool, type(None)))
+
+# Non-negative tuple tags are struct codes, which are their index in _STRUCTS. Only
+# append to _STRUCTS and _FUNCS. Changing an existing struct's fields needs a new
+# VERSION
+_REF = -1
+_TUPLE = -2
+_DATETIME = -3
+_DEFERRED = -4
+
+_STRUCTS = (
+    structs.Aircraft,
+    structs.Units,
+    structs.Number,
+    structs.Fraction,
+    structs.Timestamp,
+    structs.Cloud,
+    structs.Location,
+    structs.RemarksData,
+    structs.MetarData,
+    structs.TafLineData,
+    structs.TafData,
+    structs.MetarTrans,
+    structs.TafLineTrans,
+    structs.TafTrans,
+    structs.Turbulence,
+    structs.Icing,
+    structs.PirepData,
+)
+# Frozen structs without list fields. Equal values decode to one shared instance
+_SHARED = (
+    structs.Aircraft,
+    structs.Units,
+    structs.Number,
+    structs.Fraction,
+    structs.Timestamp,
+    structs.Cloud,
+)
+# Lazy field functions which can be stored unresolved
+_FUNCS = (_core.spoken_number, _core._spoken_fraction, _core.unpack_fraction)
+_FUNC_CODES = {func: code for code, func in enumerate(_FUNCS)}
+
+
+def _state_getter(cls: type) -> "Callable":
+    """
+    Returns a function returning a struct's field values with lazy fields unresolved
+    """
+    names = []
+    for field in fields(cls):
+        # Lazy fields keep their value in an underscored slot
+        lazy = isinstance(getattr(cls, field.name), structs._LazyField)
+        names.append("_" + field.name if lazy else field.name)
+    getter = attrgetter(*names)
+    return getter if len(names) > 1 else lambda value: (getter(value),)
+
+
+_STRUCT_CODES = {cls: (code, _state_getter(cls)) for code, cls in enumerate(_STRUCTS)}
+_SHARED_CODES = frozenset(_STRUCT_CODES[cls][0] for cls in _SHARED)
+
+
+def _flatten(value: object, memo: dict) -> object:
+    """
+    Returns a value converted to nested marshal types
+
+    Structs become tuples starting with their code. A struct already seen in the same
+    value, like a shared Number, becomes a reference to its first position
+    """
+    cls = type(value)
+    if cls is list:
+        return [
+            item if type(item) in _PLAIN else _flatten(item, memo) for item in value
+        ]
+    spec = _STRUCT_CODES.get(cls)
+    if spec is not None:
+        index = memo.get(id(value))
+        if index is not None:
+            return (_REF, index)
+        memo[id(value)] = len(memo)
+        code, getter = spec
+        state = getter(value)
+        return (
+            code,
+            *[item if type(item) in _PLAIN else _flatten(item, memo) for item in state],
+        )
+    if cls is datetime:
+        offset = value.utcoffset()
+        return (
+            _DATETIME,
+            value.toordinal(),
+            value.hour * 3600 + value.minute * 60 + value.second,
+            value.microsecond,
+            None if offset is None else int(offset.total_seconds()),
+        )
+    if cls is structs.Deferred:
+        try:
+            return (_DEFERRED, _FUNC_CODES[value.func], *value.args)
+        except KeyError:
+            raise TypeError(f"Cannot encode deferred {value.func.__name__}") from None
+    if cls is tuple:
+        return (_TUPLE, *[_flatten(item, memo) for item in value])
+    if cls is dict:
+        return {key: _flatten(item, memo) for key, item in value.items()}
+    if cls in _PLAIN:
+        return value
+    raise TypeError(f"Cannot encode {cls.__name__}")
+
+
+def _build(value: tuple, memo: list) -> object:
+    """
+    Returns a struct rebuilt from its flattened tuple
+    """
+    cls = _STRUCTS[value[0]]
+    ret = cls.__new__(cls)
+    state = [
+        item if type(item) in _PLAIN else _unflatten(item, memo) for item in value[1:]
+    ]
+    ret.__setstate__(state)
+    return ret
+
+
+@lru_cache(maxsize=4096)
+def _build_shared(value: tuple, _types: tuple) -> object:
+    """
+    Returns a shared struct for a flattened tuple. These never contain references
+
+    The field types are part of the cache key so 1 and 1.0 stay distinct
+    """
+    return _build(value, None)
+
+
+def _unflatten(value: object, memo: list) -> object:
+    """
+    Returns a value rebuilt from the output of _flatten
+    """
+    cls = type(value)
+    if cls is list:
+        return [
+            item if type(item) in _PLAIN else _unflatten(item, memo) for item in value
+        ]
+    if cls is dict:
+        return {key: _unflatten(item, memo) for key, item in value.items()}
+    if cls is not tuple:
+        return value
+    code = value[0]
+    if code >= 0:
+        if code in _SHARED_CODES:
+            ret = _build_shared(value, tuple(map(type, value)))
+            memo.append(ret)
+            return ret
+        # Reserve the struct's position before its fields add theirs
+        index = len(memo)
+        memo.append(None)
+        ret = memo[index] = _build(value, memo)
+        return ret
+    if code == _REF:
+        return memo[value[1]]
+    if code == _DATETIME:
+        _, day, seconds, microsecond, offset = value
+        if offset is None:
+            tzinfo = None
+        else:
+            tzinfo = timezone(timedelta(seconds=offset)) if offset else timezone.utc
+        hour, seconds = divmod(seconds, 3600)
+        minute, second = divmod(seconds, 60)
+        return datetime.fromordinal(day).replace(
+            hour=hour,
+            minute=minute,
+            second=second,
+            microsecond=microsecond,
+            tzinfo=tzinfo,
+        )
+    if code == _DEFERRED:
+        return structs.Deferred(_FUNCS[value[1]], *value[2:])
+    if code == _TUPLE:
+        return tuple(_unflatten(item, memo) for item in value[1:])
+    raise ValueError(f"Unknown value code {code}")
+
+
+def encode(value: object, compress: bool = True) -> bytes:
+    """
+    Returns the binary encoding of a report struct
+
+    Lists, tuples, and dicts of structs, like parse results, can also be encoded.
+    Turn off compression to trade size for speed, like for inter-process messages
+    """
+    data = marshal.dumps(_flatten(value, {}), _MARSHAL_VERSION)
+    if compress:
+        return _MAGIC + bytes((VERSION, _COMPRESSED)) + zlib.compress(data, 1)
+    return _MAGIC + bytes((VERSION, 0)) + data
+
+
+def decode(data: bytes) -> object:
+    """
+    Returns the value from bytes created by encode
+
+    Raises a ValueError if the data was not encoded by this version. Like pickle,
+    only decode data from a trusted source
+    """
+    if len(data) < 4 or data[:2] != _MAGIC:
+        raise ValueError("Data is not an encoded value")
+    if data[2] != VERSION:
+        raise ValueError(f"Encoded with version {data[2]} but expected {VERSION}")
+    try:
+        if data[3] & _COMPRESSED:
+            data = zlib.decompress(data[4:])
+        else:
+            data = data[4:]
+        value = marshal.loads(data)
+    except (EOFError, TypeError, ValueError, zlib.error) as exc:
+        raise ValueError("Encoded value is truncated or corrupt") from exc
+    try:
+        return _unflatten(value, [])
+    except (IndexError, KeyError, TypeError) as exc:
+        raise ValueError("Encoded value is corrupt") from exc
@@ -0,0 +1,170 @@
+"""
+Per-station METAR history stored in memory-mapped column files
+
+Each station has a folder with one append-only file per metar.COLUMNS column. Reads
+map the files instead of loading them, so slicing a time range only touches the
+rows it needs. Rows must be appended in time order for each station
+"""
+
+# stdlib
+from datetime import timezone
+from pathlib import Path
+
+# module
+from avwx.metar import COLUMNS
+
+# We catch this import error only if user attempts to use the history store
+try:
+    import numpy
+except ModuleNotFoundError:
+    pass
+
+# The station is the folder name, so it isn't stored with each row
+_STORED = tuple((name, kind) for name, kind in COLUMNS if name != "station")
+
+
+def _fill_value(kind: str) -> object:
+    """
+    Returns the value stored for a masked column value
+    """
+    return numpy.nan if kind.startswith("f") else -1
+
+
+class HistoryStore:
+    """
+    Append-only store of parse_columns rows split by station
+    """
+
+    def __init__(self, path: str):
+        try:
+            self._dtype = numpy.dtype(list(COLUMNS))
+        except NameError:
+            raise ModuleNotFoundError("NumPy must be installed to use HistoryStore")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _files(self, station: str) -> {str: Path}:
+        """
+        Returns the column file paths for a station
+        """
+        folder = self.path / station.upper()
+        return {name: folder / f"{name}.bin" for name, _ in _STORED}
+
+    def __len__(self) -> int:
+        return sum(self.count(station) for station in self.stations())
+
+    def stations(self) -> [str]:
+        """
+        Returns the stations with stored history
+        """
+        return sorted(path.name for path in self.path.iterdir() if path.is_dir())
+
+    def count(self, station: str) -> int:
+        """
+        Returns the number of rows stored for a station
+
+        Rows only count once every column has been written, so an interrupted append
+        is ignored and later overwritten
+        """
+        counts = []
+        for (_, kind), path in zip(_STORED, self._files(station).values()):
+            try:
+                counts.append(path.stat().st_size // numpy.dtype(kind).itemsize)
+            except FileNotFoundError:
+                return 0
+        return min(counts)
+
+    def append(self, data: "numpy.ma.MaskedArray") -> int:
+        """
+        Appends rows from metar.parse_columns to each row's station history
+
+        Rows without a time are skipped. Raises a ValueError without writing anything
+        if a row is older than the station's last stored row
+
+        Returns the number of rows appended
+        """
+        data = numpy.ma.asarray(data)
+        data = data[~numpy.ma.getmaskarray(data["time"])]
+        batches = []
+        for station in numpy.unique(data["station"].filled("")):
+            if not station:
+                continue
+            rows = data[data["station"].filled("") == station]
+            rows = rows[numpy.argsort(rows["time"].data, kind="stable")]
+            last = self.last_n(station, 1)
+            if len(last) and rows["time"].data[0] < last["time"].data[0]:
+                raise ValueError(f"Cannot append {station} rows older than its history")
+            batches.append((station, rows))
+        for station, rows in batches:
+            count = self.count(station)
+            files = self._files(station)
+            next(iter(files.values())).parent.mkdir(exist_ok=True)
+            for name, kind in _STORED:
+                values = rows[name].filled(_fill_value(kind)).astype(kind)
+                with files[name].open("ab") as stream:
+                    # Drop any rows from an interrupted append
+                    stream.truncate(count * values.itemsize)
+                    stream.write(values.tobytes())
+        return sum(len(rows) for _, rows in batches)
+
+    def _read(self, station: str, start: int, end: int) -> "numpy.ma.MaskedArray":
+        """
+        Returns rows start to end for a station as a masked structured array
+        """
+        end = max(start, end)
+        data = numpy.zeros(end - start, dtype=self._dtype)
+        mask = numpy.zeros(end - start, dtype=[(name, bool) for name, _ in COLUMNS])
+        data["station"] = station.upper()
+        if end > start:
+            for name, kind in _STORED:
+                path = self._files(station)[name]
+                values = numpy.memmap(path, dtype=kind, mode="r", shape=(end,))[start:]
+                data[name] = values
+                if kind.startswith("f"):
+                    mask[name] = numpy.isnan(values)
+                elif name != "time":
+                    mask[name] = values == -1
+        return numpy.ma.MaskedArray(data, mask=mask)
+
+    def _times(self, station: str, count: int) -> "numpy.memmap":
+        """
+        Returns the mapped time column for a station
+        """
+        path = self._files(station)["time"]
+        return numpy.memmap(path, dtype="datetime64[m]", mode="r", shape=(count,))
+
+    @staticmethod
+    def _minute(when: "datetime") -> "numpy.datetime64":
+        """
+        Returns a datetime as naive UTC minutes
+        """
+        if getattr(when, "tzinfo", None) is not None:
+            when = when.astimezone(timezone.utc).replace(tzinfo=None)
+        return numpy.datetime64(when, "m")
+
+    def range(
+        self, station: str, start: "datetime" = None, end: "datetime" = None
+    ) -> "numpy.ma.MaskedArray":
+        """
+        Returns a station's rows with times from start up to but not including end
+
+        Times are datetime64 values or datetimes, which are UTC if naive. Only the rows
+        in range and the time pages needed to find them are read from disk
+        """
+        count = self.count(station)
+        if not count:
+            return self._read(station, 0, 0)
+        times = self._times(station, count)
+        first, last = 0, count
+        if start is not None:
+            first = int(numpy.searchsorted(times, self._minute(start)))
+        if end is not None:
+            last = int(numpy.searchsorted(times, self._minute(end)))
+        return self._read(station, first, last)
+
+    def last_n(self, station: str, n: int) -> "numpy.ma.MaskedArray":
+        """
+        Returns a station's most recent n rows in time order
+        """
+        count = self.count(station)
+        return self._read(station, max(0, count - n), count)
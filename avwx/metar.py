@@ -4,29 +4,237 @@ Contains METAR-specific functions for report parsing
 
 # stdlib
 from copy import copy
+from datetime import datetime, timezone
+from functools import lru_cache, partial
 
 # module
-from avwx import _core, remarks, service
-from avwx.static import FLIGHT_RULES, IN_UNITS, NA_UNITS
+from avwx import _core, cache, remarks, service
+from avwx.static import FLIGHT_RULES
 from avwx.station import uses_na_format, valid_station
-from avwx.structs import MetarData, Units
+from avwx.structs import MetarData, Number, Units
 
+# We catch this import error only if user attempts columnar parsing
+try:
+    import numpy
+except ModuleNotFoundError:
+    pass
 
-def parse(station: str, report: str) -> (MetarData, Units):
+
+@cache.cached_parse("metar")
+def parse(
+    station: str, report: str, issued: "date/datetime" = None, fields: {str} = None
+) -> (MetarData, Units):
     """
     Returns MetarData and Units dataclasses with parsed data and their associated units
+
+    The report timestamp is resolved near the issued date or datetime, or now if not set
+
+    If a set of MetarData field names is given, parse stages not needed for those
+    fields are skipped and every other field is None
     """
     valid_station(station)
     if not report:
         return None, None
-    return parse_na(report) if uses_na_format(station[:2]) else parse_in(report)
+    parser = parse_na if uses_na_format(station[:2]) else parse_in
+    return parser(report, issued, fields)
+
+
+def parse_many(
+    reports: [(str, str)],
+    workers: int = None,
+    chunksize: int = None,
+    use_threads: bool = False,
+    issued: "date/datetime" = None,
+    fields: {str} = None,
+) -> ["(MetarData, Units)/Exception"]:
+    """
+    Parses many station, report pairs across a pool of worker processes
+
+    Reports may also be station, report, issued tuples. Otherwise every report uses
+    issued, or the time the batch started, as its reference time
+
+    Returns parse results in the same order as the given reports. If a report fails
+    to parse, the raised exception is returned in its place
+    """
+    parser = partial(parse, fields=fields) if fields is not None else parse
+    return _core.parse_many(parser, reports, workers, chunksize, use_threads, issued)
+
+
+#: Name and NumPy type of each parse_columns column
+COLUMNS = (
+    ("station", "U4"),
+    ("time", "datetime64[m]"),
+    ("wind_direction", "f4"),
+    ("wind_speed", "f4"),
+    ("wind_gust", "f4"),
+    ("visibility", "f4"),
+    ("ceiling", "f4"),
+    ("temperature", "f4"),
+    ("dewpoint", "f4"),
+    ("altimeter", "f4"),
+    ("flight_rules", "i1"),
+)
+
+# Report fields needed to fill the columns
+_COLUMN_FIELDS = frozenset(
+    (
+        "station",
+        "time",
+        "wind_direction",
+        "wind_speed",
+        "wind_gust",
+        "visibility",
+        "clouds",
+        "temperature",
+        "dewpoint",
+        "altimeter",
+    )
+)
+
+# Column values are converted to knots, meters, and hectopascals
+_TO_KNOTS = {"kt": 1, "m/s": 1.943844, "km/h": 0.539957}
+_TO_METERS = {"m": 1, "sm": 1609.344}
+_TO_HPA = {"hPa": 1, "inHg": 33.8639}
 
 
-def parse_na(report: str) -> (MetarData, Units):
+def _column_arrays(size: int) -> ("numpy.ndarray", "numpy.ndarray"):
+    """
+    Returns empty data and fully masked arrays for parse_columns
+    """
+    try:
+        data = numpy.zeros(size, dtype=list(COLUMNS))
+        mask = numpy.ones(size, dtype=[(name, bool) for name, _ in COLUMNS])
+    except NameError:
+        raise ModuleNotFoundError("NumPy must be installed to use parse_columns")
+    return data, mask
+
+
+def _column_value(number: Number) -> float:
+    """
+    Returns the value of a Number or its bound for values like P6SM and M1/4
+    """
+    if number is None:
+        return None
+    if number.value is None and number.repr[:1] in ("P", "M"):
+        number = _core.make_number(number.repr[1:].replace("SM", ""))
+        return number.value if number else None
+    return number.value
+
+
+def parse_columns(
+    reports: [(str, str)], issued: "date/datetime" = None
+) -> "numpy.ma.MaskedArray":
+    """
+    Parses many station, report pairs into a masked NumPy structured array
+
+    Reports may also be station, report, issued tuples. Otherwise every report uses
+    issued, or the time the batch started, as its reference time
+
+    Columns are listed in COLUMNS. Speeds are in knots, visibility in meters,
+    altimeter in hPa, temperatures in Celsius, and ceiling in hundreds of feet.
+    Flight rules are the index in static.FLIGHT_RULES. Missing values and reports
+    which fail to parse are masked
+    """
+    data, mask = _column_arrays(len(reports))
+    columns = {name: data[name] for name, _ in COLUMNS}
+    masks = {name: mask[name] for name, _ in COLUMNS}
+    needed, last = _plan(_COLUMN_FIELDS)
+    issued = issued or datetime.now(tz=timezone.utc)
+    for i, (station, report, *when) in enumerate(reports):
+        columns["station"][i] = station
+        masks["station"][i] = False
+        if not report:
+            continue
+        try:
+            valid_station(station)
+            parser = _parse_na if uses_na_format(station[:2]) else _parse_in
+            wxresp, units = parser(report, when[0] if when else issued, needed, last)
+        except Exception:  # pylint: disable=broad-except
+            continue
+        ceiling = _core.get_ceiling(wxresp["clouds"])
+        values = {
+            "wind_direction": _column_value(wxresp["wind_direction"]),
+            "wind_speed": _column_value(wxresp["wind_speed"]),
+            "wind_gust": _column_value(wxresp["wind_gust"]),
+            "visibility": _column_value(wxresp["visibility"]),
+            "ceiling": ceiling.base if ceiling else None,
+            "temperature": _column_value(wxresp["temperature"]),
+            "dewpoint": _column_value(wxresp["dewpoint"]),
+            "altimeter": _column_value(wxresp["altimeter"]),
+            "flight_rules": _core.get_flight_rules(wxresp["visibility"], ceiling),
+        }
+        for key in ("wind_speed", "wind_gust"):
+            if values[key] is not None:
+                values[key] *= _TO_KNOTS.get(units.wind_speed, 1)
+        if values["visibility"] is not None:
+            values["visibility"] *= _TO_METERS.get(units.visibility, 1)
+        if values["altimeter"] is not None:
+            values["altimeter"] *= _TO_HPA.get(units.altimeter, 1)
+        if wxresp["time"]:
+            values["time"] = wxresp["time"].dt.replace(tzinfo=None)
+        for key, value in values.items():
+            if value is not None:
+                columns[key][i] = value
+                masks[key][i] = False
+    return numpy.ma.MaskedArray(data, mask=mask)
+
+
+FIELDS = _core.struct_fields(MetarData)
+
+# Parse stage which sets each field. Each stage removes its elements from the report
+# list before the next one runs, so a field also needs every stage before its own
+_STAGES = {
+    "station": 0,
+    "time": 0,
+    "runway_visibility": 1,
+    "clouds": 2,
+    "wind_direction": 3,
+    "wind_speed": 3,
+    "wind_gust": 3,
+    "wind_variable_direction": 3,
+    "altimeter": 4,
+    "visibility": 5,
+    "temperature": 6,
+    "dewpoint": 6,
+    "other": 6,
+}
+
+# Fields calculated from other fields
+_DEPENDS = {"flight_rules": ("clouds", "visibility")}
+
+
+@lru_cache(maxsize=64)
+def _plan(fields: "frozenset") -> ({str}, int):
+    """
+    Returns the fields to calculate and the last parse stage to run
+    """
+    if fields is None:
+        return set(FIELDS), max(_STAGES.values())
+    _core.check_fields(fields, FIELDS)
+    needed = set(fields)
+    for field in fields:
+        needed.update(_DEPENDS.get(field, ()))
+    return needed, max((_STAGES.get(field, 0) for field in needed), default=0)
+
+
+def parse_na(
+    report: str, issued: "date/datetime" = None, fields: {str} = None
+) -> (MetarData, Units):
     """
     Parser for the North American METAR variant
     """
-    units = Units(**NA_UNITS)
+    needed, last = _plan(_core.frozen(fields))
+    wxresp, units = _parse_na(report, issued, needed, last)
+    return MetarData(**_core.project_fields(FIELDS, wxresp, fields)), units
+
+
+def _parse_na(
+    report: str, issued: "date/datetime", needed: {str}, last: int
+) -> (dict, Units):
+    """
+    Returns the North American report values needed as a dict
+    """
+    units = _core.UNITS["NA"]
     wxresp = {"raw": report}
     clean = _core.sanitize_report_string(report)
     wxdata, wxresp["remarks"] = _core.get_remarks(clean)
@@ -34,34 +242,51 @@ def parse_na(report: str) -> (MetarData, Units):
     wxdata = _core.sanitize_report_list(wxdata)
     wxresp["sanitized"] = " ".join(wxdata + [wxresp["remarks"]])
     wxdata, wxresp["station"], wxresp["time"] = _core.get_station_and_time(wxdata)
-    wxdata, wxresp["runway_visibility"] = _core.get_runway_visibility(wxdata)
-    wxdata, wxresp["clouds"] = _core.get_clouds(wxdata)
-    (
-        wxdata,
-        wxresp["wind_direction"],
-        wxresp["wind_speed"],
-        wxresp["wind_gust"],
-        wxresp["wind_variable_direction"],
-    ) = _core.get_wind(wxdata, units)
-    wxdata, wxresp["altimeter"] = _core.get_altimeter(wxdata, units, "NA")
-    wxdata, wxresp["visibility"] = _core.get_visibility(wxdata, units)
-    wxresp["other"], wxresp["temperature"], wxresp["dewpoint"] = _core.get_temp_and_dew(
-        wxdata
-    )
-    condition = _core.get_flight_rules(
-        wxresp["visibility"], _core.get_ceiling(wxresp["clouds"])
-    )
-    wxresp["flight_rules"] = FLIGHT_RULES[condition]
-    wxresp["remarks_info"] = remarks.parse(wxresp["remarks"])
-    wxresp["time"] = _core.make_timestamp(wxresp["time"])
-    return MetarData(**wxresp), units
+    if last >= 1:
+        wxdata, wxresp["runway_visibility"] = _core.get_runway_visibility(wxdata)
+    if last >= 2:
+        wxdata, wxresp["clouds"] = _core.get_clouds(wxdata)
+    if last >= 3:
+        (
+            wxdata,
+            wxresp["wind_direction"],
+            wxresp["wind_speed"],
+            wxresp["wind_gust"],
+            wxresp["wind_variable_direction"],
+            units,
+        ) = _core.get_wind(wxdata, units)
+    if last >= 4:
+        wxdata, wxresp["altimeter"], units = _core.get_altimeter(wxdata, units, "NA")
+    if last >= 5:
+        wxdata, wxresp["visibility"], units = _core.get_visibility(wxdata, units)
+    if last >= 6:
+        (
+            wxresp["other"],
+            wxresp["temperature"],
+            wxresp["dewpoint"],
+        ) = _core.get_temp_and_dew(wxdata)
+    _finish(wxresp, needed, issued)
+    return wxresp, units
 
 
-def parse_in(report: str) -> (MetarData, Units):
+def parse_in(
+    report: str, issued: "date/datetime" = None, fields: {str} = None
+) -> (MetarData, Units):
     """
     Parser for the International METAR variant
     """
-    units = Units(**IN_UNITS)
+    needed, last = _plan(_core.frozen(fields))
+    wxresp, units = _parse_in(report, issued, needed, last)
+    return MetarData(**_core.project_fields(FIELDS, wxresp, fields)), units
+
+
+def _parse_in(
+    report: str, issued: "date/datetime", needed: {str}, last: int
+) -> (dict, Units):
+    """
+    Returns the International report values needed as a dict
+    """
+    units = _core.UNITS["IN"]
     wxresp = {"raw": report}
     clean = _core.sanitize_report_string(report)
     wxdata, wxresp["remarks"] = _core.get_remarks(clean)
@@ -69,30 +294,50 @@ def parse_in(report: str) -> (MetarData, Units):
     wxdata = _core.sanitize_report_list(wxdata)
     wxresp["sanitized"] = " ".join(wxdata + [wxresp["remarks"]])
     wxdata, wxresp["station"], wxresp["time"] = _core.get_station_and_time(wxdata)
-    wxdata, wxresp["runway_visibility"] = _core.get_runway_visibility(wxdata)
-    if "CAVOK" not in wxdata:
-        wxdata, wxresp["clouds"] = _core.get_clouds(wxdata)
-    (
-        wxdata,
-        wxresp["wind_direction"],
-        wxresp["wind_speed"],
-        wxresp["wind_gust"],
-        wxresp["wind_variable_direction"],
-    ) = _core.get_wind(wxdata, units)
-    wxdata, wxresp["altimeter"] = _core.get_altimeter(wxdata, units, "IN")
-    if "CAVOK" in wxdata:
-        wxresp["visibility"] = _core.make_number("CAVOK")
-        wxresp["clouds"] = []
-        wxdata.remove("CAVOK")
-    else:
-        wxdata, wxresp["visibility"] = _core.get_visibility(wxdata, units)
-    wxresp["other"], wxresp["temperature"], wxresp["dewpoint"] = _core.get_temp_and_dew(
-        wxdata
-    )
-    condition = _core.get_flight_rules(
-        wxresp["visibility"], _core.get_ceiling(wxresp["clouds"])
-    )
-    wxresp["flight_rules"] = FLIGHT_RULES[condition]
-    wxresp["remarks_info"] = remarks.parse(wxresp["remarks"])
-    wxresp["time"] = _core.make_timestamp(wxresp["time"])
-    return MetarData(**wxresp), units
+    if last >= 1:
+        wxdata, wxresp["runway_visibility"] = _core.get_runway_visibility(wxdata)
+    if last >= 2:
+        if "CAVOK" in wxdata:
+            wxresp["clouds"] = []
+        else:
+            wxdata, wxresp["clouds"] = _core.get_clouds(wxdata)
+    if last >= 3:
+        (
+            wxdata,
+            wxresp["wind_direction"],
+            wxresp["wind_speed"],
+            wxresp["wind_gust"],
+            wxresp["wind_variable_direction"],
+            units,
+        ) = _core.get_wind(wxdata, units)
+    if last >= 4:
+        wxdata, wxresp["altimeter"], units = _core.get_altimeter(wxdata, units, "IN")
+    if last >= 5:
+        if "CAVOK" in wxdata:
+            wxresp["visibility"] = _core.make_number("CAVOK")
+            wxdata.remove("CAVOK")
+        else:
+            wxdata, wxresp["visibility"], units = _core.get_visibility(wxdata, units)
+    if last >= 6:
+        (
+            wxresp["other"],
+            wxresp["temperature"],
+            wxresp["dewpoint"],
+        ) = _core.get_temp_and_dew(wxdata)
+    _finish(wxresp, needed, issued)
+    return wxresp, units
+
+
+def _finish(wxresp: dict, needed: {str}, issued: "date/datetime"):
+    """
+    Adds the fields calculated after the report elements are parsed
+    """
+    if "flight_rules" in needed:
+        condition = _core.get_flight_rules(
+            wxresp["visibility"], _core.get_ceiling(wxresp["clouds"])
+        )
+        wxresp["flight_rules"] = FLIGHT_RULES[condition]
+    if "remarks_info" in needed:
+        wxresp["remarks_info"] = remarks.parse(wxresp["remarks"])
+    if "time" in needed:
+        wxresp["time"] = _core.make_timestamp(wxresp["time"], issued=issued)
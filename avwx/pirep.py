@@ -2,7 +2,7 @@
 Functions for parsing PIREPs
 """
 
-from avwx import _core, static, structs
+from avwx import _core, structs
 from avwx.exceptions import BadStation
 from avwx.structs import (
     Aircraft,
@@ -13,11 +13,8 @@ from avwx.structs import (
     PirepData,
     Timestamp,
     Turbulence,
-    Units,
 )
 
-_units = Units(**static.NA_UNITS)
-
 
 def _root(item: str) -> dict:
     """
@@ -63,11 +60,11 @@ def _location(item: str) -> Location:
     return Location(item, station, direction, distance)
 
 
-def _time(item: str) -> Timestamp:
+def _time(item: str, issued: "date/datetime" = None) -> Timestamp:
     """
     Convert a time element to a Timestamp
     """
-    return _core.make_timestamp(item, time_only=True)
+    return _core.make_timestamp(item, time_only=True, issued=issued)
 
 
 def _altitude(item: str) -> "Number|str":
@@ -171,15 +168,16 @@ def _wx(item: str) -> dict:
     items = item.split()
     for item in items:
         if len(item) > 2 and item.startswith("FV"):
-            _, ret["flight_visibility"] = _core.get_visibility([item[2:]], _units)
+            _, ret["flight_visibility"], _ = _core.get_visibility(
+                [item[2:]], _core.UNITS["NA"]
+            )
         else:
-            ret["wx"].append(item)
+            ret["wx"].append(_core.intern_token(item))
     return ret
 
 
 _handlers = {
     "OV": ("location", _location),
-    "TM": ("time", _time),
     "FL": ("altitude", _altitude),
     "TP": ("aircraft", _aircraft),
     "SK": ("clouds", _clouds),
@@ -193,9 +191,11 @@ _handlers = {
 _dict_handlers = {"WX": _wx}
 
 
-def parse(report: str) -> PirepData:
+def parse(report: str, issued: "date/datetime" = None) -> PirepData:
     """
     Returns a PirepData object based on the given report
+
+    The report time is resolved on the issued date, or today if not given
     """
     if not report:
         return None
@@ -209,7 +209,9 @@ def parse(report: str) -> PirepData:
             continue
         tag = item[:2]
         item = item[2:].strip()
-        if tag in _handlers:
+        if tag == "TM":
+            wxresp["time"] = _time(item, issued)
+        elif tag in _handlers:
             key, handler = _handlers[tag]
             wxresp[key] = handler(item)
         elif tag in _dict_handlers:
@@ -3,29 +3,300 @@ Station handling and search
 """
 
 # stdlib
+import json
 import math
+import mmap
+import os
+import struct
+from bisect import bisect_left, bisect_right
 from copy import copy
 from dataclasses import dataclass
+from pathlib import Path
 
 # library
 from geopy.distance import great_circle, Distance
 
 # module
+from avwx._core import StructCache
 from avwx.exceptions import BadStation
 from avwx.static import IN_REGIONS, M_IN_REGIONS, M_NA_REGIONS, NA_REGIONS
-from avwx.structs import _LazyLoad
+from avwx.structs import _LazyLoad, _slots
 
 # We catch this import error only if user attempts coord lookup
 try:
-    from scipy.spatial import KDTree
+    import numpy
 except ModuleNotFoundError:
     pass
 
 
 __LAST_UPDATED__ = "2019-10-30"
 
+_TABLE_PATH = Path(__file__).parent / "stations.bin"
+_TABLE_MAGIC = b"AVST"
+_TABLE_VERSION = 2
+# Magic, version, and station count
+_TABLE_HEADER = struct.Struct("<4sII4x")
+# Record values in this order. The ident and coordinates have their own arrays
+_RECORD_FIELDS = (
+    "city",
+    "country",
+    "elevation_ft",
+    "elevation_m",
+    "iata",
+    "name",
+    "note",
+    "reporting",
+    "runways",
+    "state",
+    "type",
+    "website",
+    "wiki",
+)
+_RUNWAY_FIELDS = ("length_ft", "width_ft", "ident1", "ident2")
+# Station flag bits used to filter searches without decoding records
+_FLAG_REPORTING = 1
+_FLAG_AIRPORT = 2
+
+
+def _flags(info: dict) -> int:
+    """
+    Returns the flag bits of a station dict
+    """
+    flags = _FLAG_REPORTING if info["reporting"] is True else 0
+    if "airport" in info["type"]:
+        flags |= _FLAG_AIRPORT
+    return flags
+
+
+def _write_table(stations: {str: dict}, path: Path):
+    """
+    Writes station dicts to a binary station table
+
+    The file has a header, latitude and longitude doubles, record end offsets, sorted
+    four-byte idents, one flag byte per station, then one compact JSON list per record
+    """
+    idents = sorted(stations)
+    records, offsets = [], []
+    for ident in idents:
+        encoded = ident.encode("ascii")
+        if len(encoded) != 4:
+            raise ValueError(f"{ident} is not a four character ident")
+        info = dict(stations[ident])
+        if info["runways"]:
+            info["runways"] = [[r[k] for k in _RUNWAY_FIELDS] for r in info["runways"]]
+        values = [info[key] for key in _RECORD_FIELDS]
+        records.append(json.dumps(values, separators=(",", ":")).encode())
+        offsets.append(offsets[-1] + len(records[-1]) if offsets else len(records[-1]))
+    count = len(idents)
+    # Replace the table in one step so readers never map a partly written file
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as stream:
+        stream.write(_TABLE_HEADER.pack(_TABLE_MAGIC, _TABLE_VERSION, count))
+        for key in ("latitude", "longitude"):
+            values = [stations[ident][key] for ident in idents]
+            stream.write(struct.pack(f"<{count}d", *values))
+        stream.write(struct.pack(f"<{count}I", *offsets))
+        stream.write(b"".join(ident.encode("ascii") for ident in idents))
+        stream.write(bytes(_flags(stations[ident]) for ident in idents))
+        stream.write(b"".join(records))
+        stream.flush()
+        os.fsync(stream.fileno())
+    os.replace(temp, path)
+
+
+class _Idents:
+    """
+    Sorted ident sequence over the table bytes for bisect
+    """
+
+    def __init__(self, data: memoryview):
+        self.data = data
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(self.data[index * 4 : index * 4 + 4])
+
+    def __len__(self) -> int:
+        return len(self.data) // 4
+
+
+class _StationTable:
+    """
+    Read-only station dicts by ident backed by the memory-mapped station table
+
+    Only the requested record is decoded. Processes forked after the file is opened
+    share its pages. Falls back to loading stations.json if the table isn't built
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._json = None
+        self._map = None
+
+    def _open(self):
+        """
+        Maps the table file or loads the JSON file if it is missing, outdated, or
+        truncated
+        """
+        try:
+            with self.path.open("rb") as stream:
+                data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            data = None
+        if data is not None and not self._valid(data):
+            data.close()
+            data = None
+        if data is not None:
+            _, _, count = _TABLE_HEADER.unpack_from(data)
+            view = memoryview(data)
+            start = _TABLE_HEADER.size
+            self.latitudes = view[start : start + count * 8].cast("d")
+            start += count * 8
+            self.longitudes = view[start : start + count * 8].cast("d")
+            start += count * 8
+            self._offsets = view[start : start + count * 4].cast("I")
+            start += count * 4
+            self.idents = _Idents(view[start : start + count * 4])
+            start += count * 4
+            self._flags = view[start : start + count]
+            self._records = start + count
+            self._map = data
+            return
+        self._json = _LazyLoad("stations")
+
+    @staticmethod
+    def _valid(data: mmap.mmap) -> bool:
+        """
+        Returns True if the data is a current table with every record, not a
+        truncated or outdated file
+        """
+        try:
+            magic, version, count = _TABLE_HEADER.unpack_from(data)
+        except struct.error:
+            return False
+        if magic != _TABLE_MAGIC or version != _TABLE_VERSION:
+            return False
+        # Header, coordinates, offsets, idents, and flags come before the records
+        records = _TABLE_HEADER.size + count * 25
+        if len(data) < records:
+            return False
+        size = (
+            struct.unpack_from("<I", data, records - count * 5 - 4)[0] if count else 0
+        )
+        return len(data) == records + size
+
+    def _mapped(self) -> bool:
+        """
+        Returns True if the table is mapped or False if using the JSON fallback
+        """
+        if self._map is None and self._json is None:
+            self._open()
+        return self._map is not None
+
+    def _index(self, key: str) -> int:
+        """
+        Returns the record index of an ident or raises a KeyError
+        """
+        try:
+            ident = key.encode("ascii")
+        except (AttributeError, UnicodeEncodeError):
+            raise KeyError(key)
+        index = bisect_left(self.idents, ident)
+        if index == len(self.idents) or self.idents[index] != ident:
+            raise KeyError(key)
+        return index
+
+    def _record(self, index: int) -> dict:
+        """
+        Returns the station dict stored at a record index
+        """
+        start = self._records + (self._offsets[index - 1] if index else 0)
+        values = json.loads(self._map[start : self._records + self._offsets[index]])
+        info = dict(zip(_RECORD_FIELDS, values))
+        if info["runways"]:
+            info["runways"] = [dict(zip(_RUNWAY_FIELDS, r)) for r in info["runways"]]
+        info["icao"] = self.idents[index].decode()
+        info["latitude"] = self.latitudes[index]
+        info["longitude"] = self.longitudes[index]
+        return info
+
+    def __getitem__(self, key: str) -> dict:
+        if not self._mapped():
+            return self._json[key]
+        return self._record(self._index(key))
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self.idents if self._mapped() else self._json)
+
+    def __iter__(self):
+        if not self._mapped():
+            yield from self._json
+        else:
+            for index in range(len(self.idents)):
+                yield self.idents[index].decode()
+
+    def values(self) -> "Iterable":
+        """
+        Returns every station dict. This decodes every record from the table
+        """
+        if not self._mapped():
+            return self._json.values()
+        return (self._record(index) for index in range(len(self.idents)))
+
+    def coord_arrays(self) -> ("numpy.ndarray", "numpy.ndarray"):
+        """
+        Returns arrays of every station latitude and longitude in ident order
+        """
+        if not self._mapped():
+            coords = self.coords()
+            return (
+                numpy.array([c[1] for c in coords], dtype=float),
+                numpy.array([c[2] for c in coords], dtype=float),
+            )
+        return (
+            numpy.frombuffer(self.latitudes, dtype=float),
+            numpy.frombuffer(self.longitudes, dtype=float),
+        )
+
+    def ident_array(self) -> "numpy.ndarray":
+        """
+        Returns an array of every station ident in sorted order
+        """
+        if not self._mapped():
+            return numpy.array([c[0] for c in self.coords()], dtype="U4")
+        return numpy.frombuffer(self.idents.data, dtype="S4").astype("U4")
+
+    def flag_array(self) -> "numpy.ndarray":
+        """
+        Returns an array of every station's filter flag bits in ident order
+        """
+        if not self._mapped():
+            return numpy.array([_flags(s) for s in self.values()], dtype=numpy.uint8)
+        return numpy.frombuffer(self._flags, dtype=numpy.uint8)
+
+    def coords(self) -> [(str, float, float)]:
+        """
+        Returns the ident, latitude, and longitude of every station
+        """
+        if not self._mapped():
+            return [(s["icao"], s["latitude"], s["longitude"]) for s in self.values()]
+        return list(
+            zip(
+                (ident.decode() for ident in self.idents),
+                self.latitudes.tolist(),
+                self.longitudes.tolist(),
+            )
+        )
+
+
 # Lazy data loading to speed up import times for unused features
-_STATIONS = _LazyLoad("stations")
+_STATIONS = _StationTable(_TABLE_PATH)
 
 
 # LazyCalc lets us avoid the global keyword
@@ -45,20 +316,428 @@ class _LazyCalc:
 
 
 def _make_coords():
-    return [(s["icao"], s["latitude"], s["longitude"]) for s in _STATIONS.values()]
+    return _STATIONS.coords()
 
 
 _COORDS = _LazyCalc(_make_coords)
 
 
+# Same mean Earth radius as geopy's great_circle
+EARTH_RADIUS_KM = 6371.009
+_KM_PER_UNIT = {"km": 1, "nm": 1.852, "mi": 1.609344}
+
+
+def _to_arc(distance: float, unit: str) -> float:
+    """
+    Returns a distance along the Earth's surface as degrees of arc
+    """
+    try:
+        km = distance * _KM_PER_UNIT[unit]
+    except KeyError:
+        raise ValueError(f"{unit} is not one of {', '.join(_KM_PER_UNIT)}")
+    return math.degrees(km / EARTH_RADIUS_KM)
+
+
+def _unit_vectors(lats: "numpy.ndarray", lons: "numpy.ndarray") -> "numpy.ndarray":
+    """
+    Returns an (n, 3) array of unit vectors for lat,lon degrees
+    """
+    lats, lons = numpy.radians(lats), numpy.radians(lons)
+    cos_lat = numpy.cos(lats)
+    return numpy.stack(
+        (cos_lat * numpy.cos(lons), cos_lat * numpy.sin(lons), numpy.sin(lats)), -1
+    )
+
+
+def _chord_squared(arc: float) -> float:
+    """
+    Returns the squared chord length between unit vectors degrees of arc apart
+    """
+    return (2 * math.sin(math.radians(arc) / 2)) ** 2
+
+
+def _arc_scalar(chord_squared: float) -> float:
+    """
+    Returns degrees of arc from a squared unit vector chord length
+    """
+    return math.degrees(2 * math.asin(min(math.sqrt(chord_squared) / 2, 1)))
+
+
+def _arc(chord_squared: "numpy.ndarray") -> "numpy.ndarray":
+    """
+    Returns degrees of arc from squared unit vector chord lengths
+    """
+    return numpy.degrees(
+        2 * numpy.arcsin(numpy.minimum(numpy.sqrt(chord_squared) / 2, 1))
+    )
+
+
+# Queries for up to this many points or row slices read row slices directly
+_SMALL_QUERY = 32
+
+
+class _GridIndex:
+    """
+    Exact great circle nearest neighbor index of lat,lon points
+
+    Points are bucketed into a coordinate grid and sorted by cell so each grid row in
+    a search area is one or two array slices. Search areas wrap across +/-180 and
+    cover every longitude near the poles. A summed count table finds a large enough
+    area before any distances are calculated. Distances are from unit vectors
+    """
+
+    def __init__(self, lats: "numpy.ndarray", lons: "numpy.ndarray", size: float = 1):
+        self.size = size
+        self.rows = math.ceil(180 / size) + 1
+        self.cols = math.ceil(360 / size) + 1
+        lats = numpy.asarray(lats, dtype=float)
+        lons = numpy.asarray(lons, dtype=float)
+        rows = numpy.clip((lats + 90) // size, 0, self.rows - 1).astype(int)
+        cols = numpy.clip((lons + 180) // size, 0, self.cols - 1).astype(int)
+        cells = rows * self.cols + cols
+        self.order = numpy.argsort(cells, kind="stable")
+        self.vectors = _unit_vectors(lats[self.order], lons[self.order])
+        self.starts = numpy.searchsorted(
+            cells[self.order], numpy.arange(self.rows * self.cols + 1)
+        )
+        counts = numpy.diff(self.starts).reshape(self.rows, self.cols)
+        self.totals = numpy.zeros((self.rows + 1, self.cols + 1), dtype=int)
+        self.totals[1:, 1:] = counts.cumsum(0).cumsum(1)
+        # Lists are faster than arrays for reading a few values at a time
+        self._starts = self.starts.tolist()
+        self._order = self.order.tolist()
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _area(self, lat: float, lon: float, radius: float) -> (int, int, list):
+        """
+        Returns the first and last row and the column spans of the cells holding
+        every point within radius degrees of arc from lat,lon
+        """
+        size, cols = self.size, self.cols - 1
+        first = max(0, int((lat - radius + 90) // size))
+        last = min(self.rows - 1, int((lat + radius + 90) // size))
+        if lat - radius <= -90 or lat + radius >= 90:
+            return first, last, [(0, cols)]
+        # Widest longitude difference of a circle around lat
+        ratio = math.sin(math.radians(radius)) / math.cos(math.radians(lat))
+        if ratio >= 1:
+            return first, last, [(0, cols)]
+        width = math.degrees(math.asin(ratio))
+        west, east = lon - width, lon + width
+        spans = [
+            (max(0, int((west + 180) // size)), min(cols, int((east + 180) // size)))
+        ]
+        if west < -180:
+            spans.append((int((west + 540) // size), cols))
+        if east >= 180:
+            spans.append((0, int((east - 180) // size)))
+        return first, last, spans
+
+    def _count(self, lat: float, lon: float, radius: float) -> int:
+        """
+        Returns the number of points in the search area around lat,lon
+        """
+        first, last, spans = self._area(lat, lon, radius)
+        totals = self.totals
+        count = 0
+        for left, right in spans:
+            count += (
+                totals[last + 1, right + 1]
+                - totals[first, right + 1]
+                - totals[last + 1, left]
+                + totals[first, left]
+            )
+        return int(count)
+
+    def _candidates(self, lat: float, lon: float, radius: float) -> "numpy.ndarray":
+        """
+        Returns the sorted positions of every point in the search area around lat,lon
+        """
+        first, last, spans = self._area(lat, lon, radius)
+        rows = numpy.arange(first * self.cols, last * self.cols + 1, self.cols)
+        if len(spans) == 1:
+            ((left, right),) = spans
+            starts, ends = self.starts[rows + left], self.starts[rows + right + 1]
+        else:
+            lefts, rights = zip(*spans)
+            starts = numpy.concatenate([self.starts[rows + i] for i in lefts])
+            ends = numpy.concatenate([self.starts[rows + i + 1] for i in rights])
+        # Concatenated ranges of each row's slice without a Python loop
+        counts = ends - starts
+        offsets = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts)
+        return offsets + numpy.arange(len(offsets))
+
+    def _slices(self, lat: float, lon: float, radius: float) -> [(int, int)]:
+        """
+        Returns the non-empty start and end positions of each row span in the search
+        area around lat,lon
+        """
+        first, last, spans = self._area(lat, lon, radius)
+        starts, cols = self._starts, self.cols
+        slices = []
+        for row in range(first * cols, last * cols + 1, cols):
+            for left, right in spans:
+                start, end = starts[row + left], starts[row + right + 1]
+                if end > start:
+                    slices.append((start, end))
+        return slices
+
+    def query(
+        self, lat: float, lon: float, k: int, bound: float = 180
+    ) -> ("numpy.ndarray", "numpy.ndarray"):
+        """
+        Returns the distances and indexes of up to k points within bound of lat,lon
+
+        Distances and bound are great circle degrees of arc
+        """
+        lat_r, lon_r = math.radians(lat), math.radians(lon)
+        target = numpy.array(
+            (
+                math.cos(lat_r) * math.cos(lon_r),
+                math.cos(lat_r) * math.sin(lon_r),
+                math.sin(lat_r),
+            )
+        )
+        bound = min(bound, 180)
+        radius = self.size
+        # The area around a cell always includes the cell itself
+        row = min(max(int((lat + 90) // self.size), 0), self.rows - 1)
+        col = min(max(int((lon + 180) // self.size), 0), self.cols - 1)
+        cell = row * self.cols + col
+        if self._starts[cell + 1] - self._starts[cell] < k:
+            while radius < bound and self._count(lat, lon, radius) < k:
+                radius *= 2
+        radius = min(radius, bound)
+        if k > _SMALL_QUERY:
+            return self._query_large(target, lat, lon, k, bound, radius)
+        while True:
+            slices = self._slices(lat, lon, radius)
+            if len(slices) > _SMALL_QUERY:
+                return self._query_large(target, lat, lon, k, bound, radius)
+            # Row slices are views, so only the dot products are copied
+            if len(slices) == 1:
+                dots = self.vectors[slices[0][0] : slices[0][1]] @ target
+            elif slices:
+                dots = numpy.concatenate(
+                    [self.vectors[i:j] @ target for i, j in slices]
+                )
+            else:
+                dots = numpy.empty(0)
+            # The largest dot products are the nearest points
+            if k == 1 and len(dots):
+                nearest = [int(dots.argmax())]
+            elif len(dots) > k:
+                nearest = numpy.argpartition(dots, len(dots) - k)[-k:].tolist()
+            else:
+                nearest = list(range(len(dots)))
+            # |a - b|^2 is 2 - 2a.b for unit vectors
+            chords = [max(2 - 2 * dot, 0) for dot in dots[nearest].tolist()]
+            if len(chords) == k and radius < bound:
+                # Every point closer than the kth must be in an area that large
+                farthest = _arc_scalar(max(chords))
+                if farthest > radius:
+                    radius = min(farthest, bound)
+                    continue
+            break
+        ends, total = [], 0
+        for start, end in slices:
+            total += end - start
+            ends.append(total)
+        limit = _chord_squared(bound)
+        found = []
+        for index, chord in zip(nearest, chords):
+            if chord <= limit:
+                i = bisect_right(ends, index)
+                position = slices[i][0] + index - (ends[i - 1] if i else 0)
+                found.append((chord, self._order[position]))
+        found.sort()
+        return (
+            numpy.array([_arc_scalar(chord) for chord, _ in found], dtype=float),
+            numpy.array([index for _, index in found], dtype=int),
+        )
+
+    def _query_large(
+        self,
+        target: "numpy.ndarray",
+        lat: float,
+        lon: float,
+        k: int,
+        bound: float,
+        radius: float,
+    ) -> ("numpy.ndarray", "numpy.ndarray"):
+        """
+        Returns query results for many neighbors or large search areas using array
+        operations over every candidate
+        """
+        # Compare squared chord lengths, which have the same order as arc lengths
+        limit = _chord_squared(bound)
+        while True:
+            found = self._candidates(lat, lon, radius)
+            dist = numpy.maximum(2 - 2 * (self.vectors[found] @ target), 0)
+            if len(dist) > k:
+                nearest = numpy.argpartition(dist, k - 1)[:k]
+                found, dist = found[nearest], dist[nearest]
+            if len(dist) == k and radius < bound:
+                farthest = _arc_scalar(dist.max())
+                if farthest > radius:
+                    radius = min(farthest, bound)
+                    continue
+            inside = dist <= limit
+            found, dist = found[inside], dist[inside]
+            nearest = numpy.argsort(dist, kind="stable")
+            return _arc(dist[nearest]), self.order[found[nearest]]
+
+    def _areas(
+        self, lats: "numpy.ndarray", lons: "numpy.ndarray", radii: "numpy.ndarray"
+    ) -> ("numpy.ndarray", "numpy.ndarray", "numpy.ndarray"):
+        """
+        Returns _area for many points as first and last row arrays and an (n, 2, 2)
+        array of column spans. Unused second spans are empty
+        """
+        size, cols = self.size, self.cols - 1
+        first = numpy.maximum((lats - radii + 90) // size, 0).astype(int)
+        last = numpy.minimum((lats + radii + 90) // size, self.rows - 1).astype(int)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            ratio = numpy.sin(numpy.radians(radii)) / numpy.cos(numpy.radians(lats))
+        full = (lats - radii <= -90) | (lats + radii >= 90) | ~(ratio < 1)
+        width = numpy.degrees(numpy.arcsin(numpy.where(full, 0, ratio)))
+        west, east = lons - width, lons + width
+        spans = numpy.empty((len(lats), 2, 2), dtype=int)
+        spans[:, 0, 0] = numpy.maximum((west + 180) // size, 0)
+        spans[:, 0, 1] = numpy.minimum((east + 180) // size, cols)
+        spans[:, 1] = (1, 0)
+        wrap = west < -180
+        spans[wrap, 1, 0] = (west[wrap] + 540) // size
+        spans[wrap, 1, 1] = cols
+        wrap = east >= 180
+        spans[wrap, 1, 0] = 0
+        spans[wrap, 1, 1] = (east[wrap] - 180) // size
+        spans[full] = ((0, cols), (1, 0))
+        return first, last, spans
+
+    def _counts(
+        self, first: "numpy.ndarray", last: "numpy.ndarray", spans: "numpy.ndarray"
+    ) -> "numpy.ndarray":
+        """
+        Returns the number of points in each of many search areas
+        """
+        totals = self.totals
+        first, last = first[:, None], last[:, None] + 1
+        left, right = spans[..., 0], spans[..., 1] + 1
+        count = totals[last, right] - totals[first, right]
+        return (count - totals[last, left] + totals[first, left]).sum(axis=1)
+
+    def _candidates_many(
+        self, first: "numpy.ndarray", last: "numpy.ndarray", spans: "numpy.ndarray"
+    ) -> ("numpy.ndarray", "numpy.ndarray"):
+        """
+        Returns the area number and sorted position of every point in many search
+        areas. Each area's points are together in area order
+        """
+        rows = last - first + 1
+        owners = numpy.repeat(numpy.arange(len(first)), rows)
+        offsets = numpy.repeat(numpy.cumsum(rows) - rows, rows)
+        cells = (numpy.arange(len(owners)) - offsets + first[owners]) * self.cols
+        starts = self.starts[cells[:, None] + spans[owners, :, 0]].ravel()
+        ends = self.starts[cells[:, None] + spans[owners, :, 1] + 1].ravel()
+        counts = ends - starts
+        owners = numpy.repeat(numpy.repeat(owners, 2), counts)
+        offsets = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts)
+        return owners, offsets + numpy.arange(len(offsets))
+
+    def query_many(
+        self, lats: [float], lons: [float], k: int, bound: float = 180
+    ) -> ("numpy.ndarray", "numpy.ndarray"):
+        """
+        Returns query results for many points at once as (points, k) arrays
+
+        Every step of the search runs over all points together. Results are sorted by
+        distance and empty slots have an infinite distance and an index of -1
+        """
+        lats = numpy.asarray(lats, dtype=float).ravel()
+        lons = numpy.asarray(lons, dtype=float).ravel()
+        bound = min(bound, 180)
+        targets = _unit_vectors(lats, lons)
+        # Grow each search area until it has at least k points
+        radii = numpy.full(len(lats), min(self.size, bound), dtype=float)
+        growing = numpy.arange(len(lats))
+        while len(growing):
+            areas = self._areas(lats[growing], lons[growing], radii[growing])
+            growing = growing[(self._counts(*areas) < k) & (radii[growing] < bound)]
+            radii[growing] = numpy.minimum(radii[growing] * 2, bound)
+        limit = _chord_squared(bound)
+        dist = numpy.full((len(lats), k), numpy.inf)
+        index = numpy.full((len(lats), k), -1)
+        pending = numpy.arange(len(lats))
+        while len(pending):
+            areas = self._areas(lats[pending], lons[pending], radii[pending])
+            owners, found = self._candidates_many(*areas)
+            # |a - b|^2 is 2 - 2a.b for unit vectors
+            dots = numpy.einsum(
+                "ij,ij->i", self.vectors[found], targets[pending][owners]
+            )
+            chord = numpy.maximum(2 - 2 * dots, 0)
+            # Sort each area's points by distance and keep the nearest k
+            order = numpy.lexsort((chord, owners))
+            owners, found, chord = owners[order], found[order], chord[order]
+            counts = numpy.bincount(owners, minlength=len(pending))
+            ranks = numpy.arange(len(owners)) - numpy.repeat(
+                numpy.cumsum(counts) - counts, counts
+            )
+            # Every point closer than the kth must be in an area that large
+            farthest = numpy.zeros(len(pending))
+            kth = ranks == k - 1
+            farthest[owners[kth]] = _arc(chord[kth])
+            radius = radii[pending]
+            retry = (farthest > radius) & (radius < bound)
+            keep = (ranks < k) & (chord <= limit) & ~retry[owners]
+            points, ranks = pending[owners[keep]], ranks[keep]
+            dist[points, ranks] = _arc(chord[keep])
+            index[points, ranks] = self.order[found[keep]]
+            radii[pending[retry]] = numpy.minimum(farthest[retry], bound)
+            pending = pending[retry]
+        return dist, index
+
+
 def _make_coord_tree():
     try:
-        return KDTree([c[1:] for c in _COORDS.value])
+        return _GridIndex(*_STATIONS.coord_arrays())
     except NameError:
-        raise ModuleNotFoundError("Scipy must be installed to use coordinate lookup")
+        raise ModuleNotFoundError("NumPy must be installed to use coordinate lookup")
 
 
 _COORD_TREE = _LazyCalc(_make_coord_tree)
+_IDENTS = _LazyCalc(_STATIONS.ident_array)
+# Indexes of only the stations matching each filter and their table positions
+_FILTERED_TREES = {}
+
+
+def _filtered_tree(is_airport: bool, reporting: bool) -> (_GridIndex, "numpy.ndarray"):
+    """
+    Returns the coordinate index of the stations matching the filters and each
+    indexed station's position in the station table
+    """
+    if not (is_airport or reporting):
+        return _COORD_TREE.value, None
+    key = (is_airport, reporting)
+    if key not in _FILTERED_TREES:
+        flags = 0
+        if is_airport:
+            flags |= _FLAG_AIRPORT
+        if reporting:
+            flags |= _FLAG_REPORTING
+        try:
+            positions = numpy.flatnonzero((_STATIONS.flag_array() & flags) == flags)
+        except NameError:
+            raise ModuleNotFoundError(
+                "NumPy must be installed to use coordinate lookup"
+            )
+        lats, lons = _STATIONS.coord_arrays()
+        tree = _GridIndex(lats[positions], lons[positions])
+        _FILTERED_TREES[key] = tree, positions
+    return _FILTERED_TREES[key]
 
 
 def uses_na_format(station: str) -> bool:
@@ -89,7 +768,8 @@ def valid_station(station: str):
     uses_na_format(station)
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class Runway:
     """
     Represents a runway at an airport
@@ -101,10 +781,13 @@ class Runway:
     ident2: str
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class Station:
     """
     Stores basic station information
+
+    Stations are shared between every lookup of the same ident, so they are frozen
     """
 
     city: str
@@ -118,7 +801,7 @@ class Station:
     name: str
     note: str
     reporting: bool
-    runways: [Runway]
+    runways: (Runway,)
     state: str
     type: str
     website: str
@@ -128,12 +811,11 @@ class Station:
     def from_icao(cls, ident: str) -> "Station":
         """
         Load a Station from an ICAO station ident
+
+        Repeated lookups return the same cached Station
         """
         try:
-            info = copy(_STATIONS[ident.upper()])
-            if info["runways"]:
-                info["runways"] = [Runway(**r) for r in info["runways"]]
-            return cls(**info)
+            return STATION_CACHE(ident.upper())
         except (KeyError, AttributeError):
             raise BadStation(f"Could not find station with ident {ident}")
 
@@ -145,15 +827,25 @@ class Station:
         is_airport: bool = False,
         sends_reports: bool = True,
         max_coord_distance: float = 10,
+        max_distance: float = None,
+        unit: str = "nm",
     ) -> ("Station", dict):
         """
         Load the Station nearest to a lat,lon coordinate pair
 
-        Returns the Station and distances from source
-
-        NOTE: Becomes less accurate toward poles and doesn't cross +/-180
+        Returns the Station and distances from source. See station.nearest for the
+        distance limits
         """
-        ret = nearest(lat, lon, 1, is_airport, sends_reports, max_coord_distance)
+        ret = nearest(
+            lat,
+            lon,
+            1,
+            is_airport,
+            sends_reports,
+            max_coord_distance,
+            max_distance,
+            unit,
+        )
         if not isinstance(ret, dict):
             return
         station = ret.pop("station")
@@ -173,53 +865,32 @@ class Station:
         return great_circle((lat, lon), (self.latitude, self.longitude))
 
 
-def _query_coords(lat: float, lon: float, n: int, d: float) -> [(str, float)]:
+def _load_station(ident: str) -> Station:
     """
-    Returns <= n number of ident, dist tuples <= d coord distance from lat,lon
+    Returns a new Station from the station table
     """
-    dist, index = _COORD_TREE.value.query([lat, lon], n, distance_upper_bound=d)
-    if n == 1:
-        dist, index = [dist], [index]
-    # NOTE: index == len of list means Tree ran out of items
-    return [
-        (_COORDS.value[i][0], d) for i, d in zip(index, dist) if i < len(_COORDS.value)
-    ]
+    info = copy(_STATIONS[ident])
+    # A tuple keeps the shared instance from being changed by one caller
+    if info["runways"] is not None:
+        info["runways"] = tuple(Runway(**r) for r in info["runways"])
+    return Station(**info)
 
 
-def _station_filter(station: Station, is_airport: bool, reporting: bool) -> bool:
-    """
-    Return True if station matches given criteria
-    """
-    if is_airport and "airport" not in station.type:
-        return False
-    if reporting and not station.sends_reports:
-        return False
-    return True
+STATION_CACHE = StructCache(_load_station)
 
 
-def _query_filter(
+def _query_coords(
     lat: float, lon: float, n: int, d: float, is_airport: bool, reporting: bool
-) -> str:
-    """
-    Returns <= n number of stations <= d distance from lat,lon matching the query params
-    """
-    k = n * 20
-    last = 0
-    stations = []
-    while True:
-        nodes = _query_coords(lat, lon, k, d)[last:]
-        # Ran out of new stations
-        if not nodes:
-            return stations
-        for icao, dist in nodes:
-            stn = Station.from_icao(icao)
-            if _station_filter(stn, is_airport, reporting):
-                stations.append((stn, dist))
-            # Reached the desired number of stations
-            if len(stations) >= n:
-                return stations
-        last = k
-        k += n * 100
+) -> [(str, float)]:
+    """
+    Returns <= n number of ident, dist tuples <= d degrees of arc from lat,lon
+    matching the query params
+    """
+    tree, positions = _filtered_tree(is_airport, reporting)
+    dist, index = tree.query(lat, lon, n, d)
+    if positions is not None:
+        index = positions[index]
+    return [(_COORDS.value[i][0], d) for i, d in zip(index.tolist(), dist.tolist())]
 
 
 def nearest(
@@ -229,37 +900,84 @@ def nearest(
     is_airport: bool = False,
     sends_reports: bool = True,
     max_coord_distance: float = 10,
+    max_distance: float = None,
+    unit: str = "nm",
 ) -> "dict/[dict]":
     """
     Finds the nearest n Stations to a lat,lon coordinate pair
 
-    Returns the Station and coordinate distance from source
+    Stations are searched by great circle distance, which is exact everywhere
+    including near the poles and across +/-180. The search is limited to
+    max_distance in the given unit ("nm", "km", or "mi") if set, or else to
+    max_coord_distance degrees of arc
 
-    NOTE: Becomes less accurate toward poles and doesn't cross +/-180
+    Returns the Station, degrees of arc as coordinate distance, and distances
     """
-    # Default state includes all, no filtering necessary
-    if not (is_airport or sends_reports):
-        stations = _query_coords(lat, lon, n, max_coord_distance)
-        stations = [(Station.from_icao(icao), d) for icao, d in stations]
-    else:
-        stations = _query_filter(
-            lat, lon, n, max_coord_distance, is_airport, sends_reports
-        )
+    if max_distance is not None:
+        max_coord_distance = _to_arc(max_distance, unit)
+    stations = _query_coords(lat, lon, n, max_coord_distance, is_airport, sends_reports)
+    stations = [(Station.from_icao(icao), d) for icao, d in stations]
     if not stations:
         return []
     ret = []
     for station, coordd in stations:
-        dist = station.distance(lat, lon)
+        km = math.radians(coordd) * EARTH_RADIUS_KM
         ret.append(
             {
                 "station": station,
                 "coordinate_distance": coordd,
-                "nautical_miles": dist.nautical,
-                "miles": dist.miles,
-                "kilometers": dist.kilometers,
+                "nautical_miles": km / _KM_PER_UNIT["nm"],
+                "miles": km / _KM_PER_UNIT["mi"],
+                "kilometers": km,
             }
         )
     if n == 1:
         return ret[0]
-    ret.sort(key=lambda x: x["miles"])
+    return ret
+
+
+def nearest_many(
+    lats: [float],
+    lons: [float],
+    n: int = 1,
+    is_airport: bool = False,
+    sends_reports: bool = True,
+    max_coord_distance: float = 10,
+    max_distance: float = None,
+    unit: str = "nm",
+    stations: bool = False,
+) -> {str: "numpy.ndarray"}:
+    """
+    Finds the nearest n stations to each of many lat,lon coordinate pairs
+
+    Takes the same filters and limits as nearest, but every point is searched in one
+    vectorized query and no Station is loaded unless stations is True
+
+    Returns a dict of (points, n) arrays sorted by distance: "index" of the station
+    in the sorted ident order, "icao", "coordinate_distance", "nautical_miles",
+    "miles", and "kilometers". Slots without a station are -1, "", and NaN. If
+    stations is True, "station" is an object array of Stations or None
+    """
+    if max_distance is not None:
+        max_coord_distance = _to_arc(max_distance, unit)
+    tree, positions = _filtered_tree(is_airport, sends_reports)
+    dist, index = tree.query_many(lats, lons, n, max_coord_distance)
+    empty = index < 0
+    if positions is not None:
+        index = numpy.where(empty, -1, positions[index])
+    dist[empty] = numpy.nan
+    km = numpy.radians(dist) * EARTH_RADIUS_KM
+    ret = {
+        "index": index,
+        "icao": numpy.where(empty, "", _IDENTS.value[index]),
+        "coordinate_distance": dist,
+        "nautical_miles": km / _KM_PER_UNIT["nm"],
+        "miles": km / _KM_PER_UNIT["mi"],
+        "kilometers": km,
+    }
+    if stations:
+        ret["station"] = numpy.array(
+            [[Station.from_icao(i) if i else None for i in row] for row in ret["icao"]],
+            dtype=object,
+        ).reshape(index.shape)
     return ret
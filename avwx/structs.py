@@ -4,7 +4,8 @@ Contains dataclasses to hold report data
 
 # stdlib
 import json
-from dataclasses import dataclass
+from copy import deepcopy
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
 
@@ -50,8 +51,174 @@ class _LazyLoad:
 AIRCRAFT = _LazyLoad("aircraft")
 
 
-@dataclass
-class Aircraft:
+class Deferred:
+    """
+    Function call for a struct field calculated on first access
+
+    Only fields listed in a struct's _lazy attribute accept a Deferred value
+    """
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: "Callable", *args):
+        self.func = func
+        self.args = args
+
+
+class _LazyField:
+    """
+    Field descriptor which resolves and stores a Deferred value when first read
+    """
+
+    def __init__(self, slot: "member_descriptor"):
+        self.slot = slot
+
+    def __get__(self, obj: object, cls: type = None) -> object:
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, cls)
+        if isinstance(value, Deferred):
+            value = value.func(*value.args)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: object, value: object):
+        self.slot.__set__(obj, value)
+
+
+_SLOTS = {}
+
+
+def _raw_slots(cls: type) -> tuple:
+    """
+    Returns the slot descriptors holding each field value without lazy resolution
+    """
+    slots = _SLOTS.get(cls)
+    if slots is None:
+        slots = []
+        for field in fields(cls):
+            attr = getattr(cls, field.name)
+            slots.append(attr.slot if isinstance(attr, _LazyField) else attr)
+        slots = _SLOTS[cls] = tuple(slots)
+    return slots
+
+
+def _getstate(self) -> list:
+    # Keep lazy fields unresolved so pickling doesn't calculate them
+    return [slot.__get__(self) for slot in _raw_slots(type(self))]
+
+
+def _setstate(self, state: list):
+    # Setting the slots directly bypasses frozen __setattr__
+    for slot, value in zip(_raw_slots(type(self)), state):
+        slot.__set__(self, value)
+
+
+def _slots(cls: type) -> type:
+    """
+    Returns a copy of a dataclass storing its fields in __slots__ instead of __dict__
+
+    Field names in the class's _lazy attribute are stored in underscored slots behind
+    a descriptor that resolves Deferred values
+    """
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        inherited.update(getattr(base, "__slots__", ()))
+        inherited.update(base.__dict__.get("_lazy", ()))
+    lazy = cls.__dict__.get("_lazy", ())
+    names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    body = dict(cls.__dict__)
+    # Defaults are already in the generated __init__ and would clash with the slots
+    for name in names + ("__dict__", "__weakref__"):
+        body.pop(name, None)
+    body["__slots__"] = tuple("_" + name if name in lazy else name for name in names)
+    body["__getstate__"] = _getstate
+    body["__setstate__"] = _setstate
+    new = type(cls)(cls.__name__, cls.__bases__, body)
+    for name in lazy:
+        setattr(new, name, _LazyField(new.__dict__["_" + name]))
+    return new
+
+
+_FIELD_NAMES = {}
+
+# Immutable values returned as-is by to_dict
+_SCALARS = frozenset((str, int, float, bool, type(None), datetime))
+
+
+def _field_names(cls: type) -> (str,):
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(field.name for field in fields(cls))
+    return names
+
+
+def _to_builtin(value: object) -> object:
+    """
+    Returns a struct value converted to match dataclasses.asdict output
+    """
+    cls = type(value)
+    if cls in _SCALARS:
+        return value
+    if cls is list:
+        return [_to_builtin(item) for item in value]
+    if hasattr(cls, "__dataclass_fields__"):
+        return {name: _to_builtin(getattr(value, name)) for name in _field_names(cls)}
+    if cls is dict:
+        return {_to_builtin(key): _to_builtin(item) for key, item in value.items()}
+    if cls is tuple:
+        return tuple(_to_builtin(item) for item in value)
+    return deepcopy(value)
+
+
+def _json_default(value: object) -> str:
+    """
+    Returns the JSON representation of values not handled by the json module
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _Struct:
+    """
+    Base for data structs with serialization helpers
+    """
+
+    __slots__ = ()
+
+    def to_dict(self) -> dict:
+        """
+        Returns the struct as nested dicts and lists like dataclasses.asdict
+        """
+        return _to_builtin(self)
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Returns the struct as a JSON string. Datetimes use ISO format
+
+        Keyword arguments are passed to json.dumps
+        """
+        return json.dumps(_to_builtin(self), default=_json_default, **kwargs)
+
+
+def write_json(items: "Iterable", stream: "TextIO", **kwargs):
+    """
+    Writes an iterable of structs to a text stream as a JSON list one item at a time
+
+    Keyword arguments are passed to json.dumps for each item
+    """
+    stream.write("[")
+    for i, item in enumerate(items):
+        if i:
+            stream.write(", ")
+        stream.write(json.dumps(_to_builtin(item), default=_json_default, **kwargs))
+    stream.write("]")
+
+
+@_slots
+@dataclass(frozen=True)
+class Aircraft(_Struct):
     code: str
     type: str
 
@@ -66,8 +233,9 @@ class Aircraft:
             raise ValueError(code + " is not a known aircraft code")
 
 
-@dataclass
-class Units:
+@_slots
+@dataclass(frozen=True)
+class Units(_Struct):
     altimeter: str
     altitude: str
     temperature: str
@@ -75,28 +243,36 @@ class Units:
     wind_speed: str
 
 
-@dataclass
-class Number:
+@_slots
+@dataclass(frozen=True)
+class Number(_Struct):
     repr: str
     value: float
     spoken: str
 
+    _lazy = ("spoken",)
+
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class Fraction(Number):
     numerator: int
     denominator: int
     normalized: str
 
+    _lazy = ("normalized",)
 
-@dataclass
-class Timestamp:
+
+@_slots
+@dataclass(frozen=True)
+class Timestamp(_Struct):
     repr: str
     dt: datetime
 
 
-@dataclass
-class Cloud:
+@_slots
+@dataclass(frozen=True)
+class Cloud(_Struct):
     repr: str
     type: str = None
     base: int = None
@@ -105,30 +281,36 @@ class Cloud:
     direction: str = None
 
 
-@dataclass
-class Location:
+@_slots
+@dataclass(frozen=True)
+class Location(_Struct):
     repr: str
     station: str
     direction: Number
     distance: Number
 
 
-@dataclass
-class RemarksData:
+@_slots
+@dataclass(frozen=True)
+class RemarksData(_Struct):
     dewpoint_decimal: float = None
     temperature_decimal: float = None
 
 
-@dataclass
-class ReportData:
+@dataclass(frozen=True)
+class ReportData(_Struct):
+    # Mixed in with SharedData, so subclasses hold these fields in their own slots
+    __slots__ = ()
+
     raw: str
     station: str
     time: Timestamp
     remarks: str
 
 
-@dataclass
-class SharedData:
+@_slots
+@dataclass(frozen=True)
+class SharedData(_Struct):
     altimeter: Number
     clouds: [Cloud]
     flight_rules: str
@@ -140,7 +322,8 @@ class SharedData:
     wind_speed: Number
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class MetarData(ReportData, SharedData):
     dewpoint: Number
     remarks_info: RemarksData
@@ -149,7 +332,8 @@ class MetarData(ReportData, SharedData):
     wind_variable_direction: [Number]
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class TafLineData(SharedData):
     end_time: Timestamp
     icing: [str]
@@ -161,7 +345,8 @@ class TafLineData(SharedData):
     wind_shear: str
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class TafData(ReportData):
     forecast: [TafLineData]
     start_time: Timestamp
@@ -172,15 +357,17 @@ class TafData(ReportData):
     temps: [str] = None
 
 
-@dataclass
-class ReportTrans:
+@_slots
+@dataclass(frozen=True)
+class ReportTrans(_Struct):
     altimeter: str
     clouds: str
     other: str
     visibility: str
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class MetarTrans(ReportTrans):
     dewpoint: str
     remarks: dict
@@ -188,7 +375,8 @@ class MetarTrans(ReportTrans):
     wind: str
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class TafLineTrans(ReportTrans):
     icing: str
     turbulence: str
@@ -196,27 +384,31 @@ class TafLineTrans(ReportTrans):
     wind_shear: str
 
 
-@dataclass
-class TafTrans:
+@_slots
+@dataclass(frozen=True)
+class TafTrans(_Struct):
     forecast: [TafLineTrans]
     max_temp: str
     min_temp: str
     remarks: dict
 
 
-@dataclass
-class Turbulence:
+@_slots
+@dataclass(frozen=True)
+class Turbulence(_Struct):
     severity: str
     floor: Number = None
     ceiling: Number = None
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class Icing(Turbulence):
     type: str = None
 
 
-@dataclass
+@_slots
+@dataclass(frozen=True)
 class PirepData(ReportData):
     aircraft: Aircraft = None
     altitude: Number = None
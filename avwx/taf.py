@@ -4,76 +4,181 @@ Contains TAF-specific functions for report parsing
 
 # stdlib
 from copy import copy
+from functools import lru_cache, partial
 
 # module
-from avwx import _core, service
-from avwx.static import IN_UNITS, NA_UNITS, TAF_NEWLINE, TAF_RMK
+from avwx import _core, cache, service
+from avwx.static import TAF_NEWLINE, TAF_RMK
 from avwx.station import uses_na_format, valid_station
 from avwx.structs import TafData, TafLineData, Units
 
 
-def parse(station: str, report: str) -> (TafData, Units):
+@cache.cached_parse("taf")
+def parse(
+    station: str, report: str, issued: "date/datetime" = None, fields: {str} = None
+) -> (TafData, Units):
     """
     Returns TafData and Units dataclasses with parsed data and their associated units
+
+    Report timestamps are resolved near the issued date or datetime, or now if not given
+
+    If a set of TafData and/or TafLineData field names is given, parse stages not
+    needed for those fields are skipped and every other field is None
     """
     if not report:
         return None, None
     valid_station(station)
+    line_fields, last = _plan(_core.frozen(fields))
     while len(report) > 3 and report[:4] in ("TAF ", "AMD ", "COR "):
         report = report[4:]
     retwx = {"end_time": None, "raw": report, "remarks": None, "start_time": None}
     report = _core.sanitize_report_string(report)
     _, station, time = _core.get_station_and_time(report[:20].split())
     retwx["station"] = station
-    retwx["time"] = _core.make_timestamp(time)
+    retwx["time"] = _core.make_timestamp(time, issued=issued)
     report = report.replace(station, "")
     if time:
         report = report.replace(time, "").strip()
     if uses_na_format(station):
         use_na = True
-        units = Units(**NA_UNITS)
+        units = _core.UNITS["NA"]
     else:
         use_na = False
-        units = Units(**IN_UNITS)
+        units = _core.UNITS["IN"]
     # Find and remove remarks
     report, retwx["remarks"] = _core.get_taf_remarks(report)
+    # Skip the forecast lines if nothing from them was requested
+    if last is None:
+        return TafData(**_core.project_fields(FIELDS, retwx, fields)), units
     # Split and parse each line
     lines = _core.split_taf(report)
-    parsed_lines = parse_lines(lines, units, use_na)
+    parsed_lines, units = parse_lines(lines, units, use_na, issued, last)
     # Perform additional info extract and corrections
     if parsed_lines:
-        (
-            parsed_lines[-1]["other"],
-            retwx["max_temp"],
-            retwx["min_temp"],
-        ) = _core.get_temp_min_and_max(parsed_lines[-1]["other"])
-        if not (retwx["max_temp"] or retwx["min_temp"]):
+        if last >= 5:
             (
-                parsed_lines[0]["other"],
+                parsed_lines[-1]["other"],
                 retwx["max_temp"],
                 retwx["min_temp"],
-            ) = _core.get_temp_min_and_max(parsed_lines[0]["other"])
+            ) = _core.get_temp_min_and_max(parsed_lines[-1]["other"])
+            if not (retwx["max_temp"] or retwx["min_temp"]):
+                (
+                    parsed_lines[0]["other"],
+                    retwx["max_temp"],
+                    retwx["min_temp"],
+                ) = _core.get_temp_min_and_max(parsed_lines[0]["other"])
         # Set start and end times based on the first line
         start, end = parsed_lines[0]["start_time"], parsed_lines[0]["end_time"]
         parsed_lines[0]["end_time"] = None
         retwx["start_time"], retwx["end_time"] = start, end
         parsed_lines = _core.find_missing_taf_times(parsed_lines, start, end)
-        parsed_lines = _core.get_taf_flight_rules(parsed_lines)
+        if "flight_rules" in line_fields:
+            parsed_lines = _core.get_taf_flight_rules(parsed_lines)
     # Extract Oceania-specific data
-    if retwx["station"][0] == "A":
+    if retwx["station"][0] == "A" and last >= 5:
         (
             parsed_lines[-1]["other"],
             retwx["alts"],
             retwx["temps"],
         ) = _core.get_oceania_temp_and_alt(parsed_lines[-1]["other"])
     # Convert to dataclass
-    retwx["forecast"] = [TafLineData(**line) for line in parsed_lines]
-    return TafData(**retwx), units
+    retwx["forecast"] = [
+        TafLineData(**_core.project_fields(LINE_FIELDS, line, line_fields))
+        for line in parsed_lines
+    ]
+    if fields is not None and line_fields:
+        fields = set(fields) | {"forecast"}
+    return TafData(**_core.project_fields(FIELDS, retwx, fields)), units
 
 
-def parse_lines(lines: [str], units: Units, use_na: bool = True) -> [dict]:
+def parse_many(
+    reports: [(str, str)],
+    workers: int = None,
+    chunksize: int = None,
+    use_threads: bool = False,
+    issued: "date/datetime" = None,
+    fields: {str} = None,
+) -> ["(TafData, Units)/Exception"]:
     """
-    Returns a list of parsed line dictionaries
+    Parses many station, report pairs across a pool of worker processes
+
+    Reports may also be station, report, issued tuples. Otherwise every report uses
+    issued, or the time the batch started, as its reference time
+
+    Returns parse results in the same order as the given reports. If a report fails
+    to parse, the raised exception is returned in its place
+    """
+    parser = partial(parse, fields=fields) if fields is not None else parse
+    return _core.parse_many(parser, reports, workers, chunksize, use_threads, issued)
+
+
+FIELDS = _core.struct_fields(TafData)
+LINE_FIELDS = _core.struct_fields(TafLineData)
+
+# Line parse stage which sets each field. Each stage removes its elements from the
+# line before the next one runs, so a field also needs every stage before its own
+_STAGES = {
+    "forecast": 0,
+    "start_time": 0,
+    "end_time": 0,
+    "probability": 0,
+    "raw": 0,
+    "sanitized": 0,
+    "type": 0,
+    "wind_shear": 1,
+    "wind_direction": 2,
+    "wind_speed": 2,
+    "wind_gust": 2,
+    "visibility": 3,
+    "clouds": 4,
+    "altimeter": 5,
+    "icing": 5,
+    "turbulence": 5,
+    "other": 5,
+    "max_temp": 5,
+    "min_temp": 5,
+    "alts": 5,
+    "temps": 5,
+}
+
+# Fields calculated from other fields. Flight rules look for SKC and CLR in other
+_DEPENDS = {"flight_rules": ("clouds", "visibility", "other")}
+
+#: Last line parse stage
+LAST_STAGE = 5
+
+
+@lru_cache(maxsize=64)
+def _plan(fields: "frozenset") -> ({str}, int):
+    """
+    Returns the line fields to calculate and the last line parse stage to run
+
+    The stage is None if the forecast lines aren't needed
+    """
+    if fields is None:
+        return set(LINE_FIELDS), LAST_STAGE
+    _core.check_fields(fields, FIELDS + LINE_FIELDS)
+    line_fields = set(fields).intersection(LINE_FIELDS)
+    if not line_fields and "forecast" in fields:
+        line_fields = set(LINE_FIELDS)
+    needed = set(fields) | line_fields
+    for field in line_fields:
+        needed.update(_DEPENDS.get(field, ()))
+    stages = [_STAGES[field] for field in needed if field in _STAGES]
+    if line_fields:
+        stages.append(0)
+    return line_fields, max(stages, default=None)
+
+
+def parse_lines(
+    lines: [str],
+    units: Units,
+    use_na: bool = True,
+    issued: "date/datetime" = None,
+    last_stage: int = LAST_STAGE,
+) -> ([dict], Units):
+    """
+    Returns a list of parsed line dictionaries and the units updated by each line
     """
     parsed_lines = []
     prob = ""
@@ -91,9 +196,10 @@ def parse_lines(lines: [str], units: Units, use_na: bool = True) -> [dict]:
                 prob = line[:6]
                 line = line[6:].strip()
         if line:
-            parsed_line = (parse_na_line if use_na else parse_in_line)(line, units)
+            parser = parse_na_line if use_na else parse_in_line
+            parsed_line, units = parser(line, units, last_stage)
             for key in ("start_time", "end_time"):
-                parsed_line[key] = _core.make_timestamp(parsed_line[key])
+                parsed_line[key] = _core.make_timestamp(parsed_line[key], issued=issued)
             parsed_line["probability"] = _core.make_number(prob[4:])
             parsed_line["raw"] = raw_line
             if prob:
@@ -101,10 +207,12 @@ def parse_lines(lines: [str], units: Units, use_na: bool = True) -> [dict]:
             prob = ""
             parsed_lines.append(parsed_line)
         lines.pop(0)
-    return parsed_lines
+    return parsed_lines, units
 
 
-def parse_na_line(line: str, units: Units) -> {str: str}:
+def parse_na_line(
+    line: str, units: Units, last_stage: int = LAST_STAGE
+) -> ({str: str}, Units):
     """
     Parser for the North American TAF forcast variant
     """
@@ -117,26 +225,34 @@ def parse_na_line(line: str, units: Units) -> {str: str}:
         retwx["start_time"],
         retwx["end_time"],
     ) = _core.get_type_and_times(wxdata)
-    wxdata, retwx["wind_shear"] = _core.get_wind_shear(wxdata)
-    (
-        wxdata,
-        retwx["wind_direction"],
-        retwx["wind_speed"],
-        retwx["wind_gust"],
-        _,
-    ) = _core.get_wind(wxdata, units)
-    wxdata, retwx["visibility"] = _core.get_visibility(wxdata, units)
-    wxdata, retwx["clouds"] = _core.get_clouds(wxdata)
-    (
-        retwx["other"],
-        retwx["altimeter"],
-        retwx["icing"],
-        retwx["turbulence"],
-    ) = _core.get_taf_alt_ice_turb(wxdata)
-    return retwx
+    if last_stage >= 1:
+        wxdata, retwx["wind_shear"] = _core.get_wind_shear(wxdata)
+    if last_stage >= 2:
+        (
+            wxdata,
+            retwx["wind_direction"],
+            retwx["wind_speed"],
+            retwx["wind_gust"],
+            _,
+            units,
+        ) = _core.get_wind(wxdata, units)
+    if last_stage >= 3:
+        wxdata, retwx["visibility"], units = _core.get_visibility(wxdata, units)
+    if last_stage >= 4:
+        wxdata, retwx["clouds"] = _core.get_clouds(wxdata)
+    if last_stage >= 5:
+        (
+            retwx["other"],
+            retwx["altimeter"],
+            retwx["icing"],
+            retwx["turbulence"],
+        ) = _core.get_taf_alt_ice_turb(wxdata)
+    return retwx, units
 
 
-def parse_in_line(line: str, units: Units) -> {str: str}:
+def parse_in_line(
+    line: str, units: Units, last_stage: int = LAST_STAGE
+) -> ({str: str}, Units):
     """
     Parser for the International TAF forcast variant
     """
@@ -149,25 +265,31 @@ def parse_in_line(line: str, units: Units) -> {str: str}:
         retwx["start_time"],
         retwx["end_time"],
     ) = _core.get_type_and_times(wxdata)
-    wxdata, retwx["wind_shear"] = _core.get_wind_shear(wxdata)
-    (
-        wxdata,
-        retwx["wind_direction"],
-        retwx["wind_speed"],
-        retwx["wind_gust"],
-        _,
-    ) = _core.get_wind(wxdata, units)
-    if "CAVOK" in wxdata:
-        retwx["visibility"] = _core.make_number("CAVOK")
-        retwx["clouds"] = []
-        wxdata.pop(wxdata.index("CAVOK"))
-    else:
-        wxdata, retwx["visibility"] = _core.get_visibility(wxdata, units)
-        wxdata, retwx["clouds"] = _core.get_clouds(wxdata)
-    (
-        retwx["other"],
-        retwx["altimeter"],
-        retwx["icing"],
-        retwx["turbulence"],
-    ) = _core.get_taf_alt_ice_turb(wxdata)
-    return retwx
+    if last_stage >= 1:
+        wxdata, retwx["wind_shear"] = _core.get_wind_shear(wxdata)
+    if last_stage >= 2:
+        (
+            wxdata,
+            retwx["wind_direction"],
+            retwx["wind_speed"],
+            retwx["wind_gust"],
+            _,
+            units,
+        ) = _core.get_wind(wxdata, units)
+    if last_stage >= 3:
+        if "CAVOK" in wxdata:
+            retwx["visibility"] = _core.make_number("CAVOK")
+            retwx["clouds"] = []
+            wxdata.pop(wxdata.index("CAVOK"))
+        else:
+            wxdata, retwx["visibility"], units = _core.get_visibility(wxdata, units)
+            if last_stage >= 4:
+                wxdata, retwx["clouds"] = _core.get_clouds(wxdata)
+    if last_stage >= 5:
+        (
+            retwx["other"],
+            retwx["altimeter"],
+            retwx["icing"],
+            retwx["turbulence"],
+        ) = _core.get_taf_alt_ice_turb(wxdata)
+    return retwx, units
@@ -2,7 +2,7 @@
 Contains functions for translating report data
 """
 
-from avwx import _core, remarks
+from avwx import _core, cache, remarks
 from avwx.static import (
     CLOUD_TRANSLATIONS,
     ICING_CONDITIONS,
@@ -338,12 +338,28 @@ def shared(wxdata: ReportData, units: Units) -> {str: str}:
     return translations
 
 
+def _check_parsed(wxdata: ReportData, names: [str]):
+    """
+    Raises a ValueError if data is missing fields a full parse always sets
+
+    Data parsed with fields leaves the rest empty and can't be translated
+    """
+    for name in names:
+        if getattr(wxdata, name) is None:
+            raise ValueError(
+                f"Report data parsed without {name} can't be translated. "
+                "Parse without fields to translate"
+            )
+
+
+@cache.cached_translation("translate.metar")
 def metar(wxdata: MetarData, units: Units) -> MetarTrans:
     """
     Translate the results of metar.parse
 
     Keys: Wind, Visibility, Clouds, Temperature, Dewpoint, Altimeter, Other
     """
+    _check_parsed(wxdata, ("clouds", "other", "remarks"))
     translations = shared(wxdata, units)
     translations["wind"] = wind(
         wxdata.wind_direction,
@@ -358,6 +374,7 @@ def metar(wxdata: MetarData, units: Units) -> MetarTrans:
     return MetarTrans(**translations)
 
 
+@cache.cached_translation("translate.taf")
 def taf(wxdata: TafData, units: Units) -> TafTrans:
     """
     Translate the results of taf.parse
@@ -366,8 +383,10 @@ def taf(wxdata: TafData, units: Units) -> TafTrans:
 
     Forecast keys: Wind, Visibility, Clouds, Altimeter, Wind-Shear, Turbulence, Icing, Other
     """
+    _check_parsed(wxdata, ("forecast", "remarks"))
     translations = {"forecast": []}
     for line in wxdata.forecast:
+        _check_parsed(line, ("clouds", "other"))
         trans = shared(line, units)
         trans["wind"] = wind(
             line.wind_direction, line.wind_speed, line.wind_gust, unit=units.wind_speed
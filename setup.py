@@ -6,7 +6,7 @@ from setuptools import setup
 
 setup(
     name="avwx-engine",
-    version="1.3.10",
+    version="1.4.0",
     description="Aviation weather report parsing library",
     url="https://github.com/avwx-rest/avwx-engine",
     author="Michael duPont",
@@ -28,10 +28,12 @@ setup(
         "xmltodict~=0.12",
     ],
     packages=["avwx"],
-    package_data={"avwx": ["aircraft.json", "stations.json"]},
+    package_data={"avwx": ["aircraft.json", "stations.bin", "stations.json"]},
     tests_require=["pytest-asyncio~=0.10"],
     extras_require={
-        "scipy": ["scipy~=1.3"],
+        "numpy": ["numpy~=1.17"],
+        # Coordinate lookup used to need scipy. Kept so old installs still work
+        "scipy": ["numpy~=1.17"],
         "dev": ["nox==2019.11.9", "pre-commit~=1.20", "pytest~=5.3"],
         "docs": ["mkdocs~=1.0"],
     },
@@ -0,0 +1,129 @@
+"""
+Archive Ingestion Tests
+"""
+
+# stdlib
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+# module
+from avwx import archive
+
+CSV = """station,valid,metar
+JFK,2019-07-03 21:51,KJFK 032151Z 16008KT 10SM FEW034 27/23 A3013 RMK AO2
+LHR,2019-07-03 21:50,EGLL 032150Z 09010KT 9999 FEW030 12/08 Q1013
+BAD,2019-07-03 21:50,12K 032150Z 09010KT
+MCO,2019-08-03 21:53,METAR KMCO 032153Z VRB03KT P6SM OVC012 M01/M03 A2992
+"""
+
+TEXT = """2019/07/03 21:51
+KJFK 032151Z 16008KT 10SM FEW034 27/23 A3013 RMK AO2
+
+2019/06/03 21:50
+EGLL 032150Z 09010KT 9999 FEW030 12/08 Q1013
+"""
+
+
+class TestArchive(unittest.TestCase):
+    """
+    Tests reading and ingesting archive files
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tempdir.name)
+        self.path.joinpath("archive.csv").write_text(CSV)
+        self.path.joinpath("archive.txt").write_text(TEXT)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_read_records(self):
+        """
+        Tests reading records and resuming from a returned offset
+        """
+        records = list(archive.read_records(self.path / "archive.csv"))
+        self.assertEqual([r[0][0] for r in records], ["KJFK", "EGLL", "12K", "KMCO"])
+        self.assertEqual(
+            records[0][0][2], datetime(2019, 7, 3, 21, 51, tzinfo=timezone.utc)
+        )
+        resumed = archive.read_records(self.path / "archive.csv", offset=records[1][1])
+        self.assertEqual([r[0] for r in resumed], [r[0] for r in records[2:]])
+        records = list(archive.read_records(self.path / "archive.txt"))
+        self.assertEqual([r[0][0] for r in records], ["KJFK", "EGLL"])
+        self.assertEqual([r[0][2].month for r in records], [7, 6])
+        with self.assertRaises(ValueError):
+            list(archive.read_records(self.path / "archive.csv", report_column="raw"))
+
+    def test_ingest(self):
+        """
+        Tests that ingestion writes every parsed report and counts failures
+        """
+        output = self.path / "out.jsonl"
+        for workers, use_threads in ((1, False), (2, True), (2, False)):
+            state = archive.ingest(
+                self.path / "archive.csv",
+                output,
+                chunk_size=2,
+                workers=workers,
+                use_threads=use_threads,
+            )
+            self.assertEqual((state["parsed"], state["failed"]), (3, 1))
+            lines = [json.loads(line) for line in output.open()]
+            self.assertEqual(len(lines), 3)
+            self.assertEqual(lines[2]["data"]["station"], "KMCO")
+            self.assertEqual(
+                lines[2]["data"]["time"]["dt"], "2019-08-03T21:53:00+00:00"
+            )
+            self.assertEqual(lines[2]["units"]["altimeter"], "inHg")
+
+    def test_resume(self):
+        """
+        Tests that ingestion resumes from a checkpoint and drops unsaved output
+        """
+        source, output = self.path / "archive.csv", self.path / "out.jsonl"
+        checkpoint = self.path / "checkpoint.json"
+        full = archive.ingest(source, output, checkpoint, chunk_size=2, workers=1)
+        self.assertEqual(archive.load_checkpoint(checkpoint), full)
+        expected = output.read_text()
+        # Rewind to the first chunk as if the run crashed while writing the second
+        first = list(archive.read_records(source))[1][1]
+        size = len("".join(expected.splitlines(True)[:2]))
+        state = dict(full, offset=first, size=size, parsed=2, failed=0)
+        checkpoint.write_text(json.dumps(state))
+        with output.open("a") as stream:
+            stream.write('{"data": {"partial')
+        state = archive.ingest(source, output, checkpoint, chunk_size=2, workers=1)
+        self.assertEqual(state, full)
+        self.assertEqual(output.read_text(), expected)
+        with self.assertRaises(ValueError):
+            archive.ingest(self.path / "archive.txt", output, checkpoint)
+
+    def test_resume_block(self):
+        """
+        Tests that resuming inside a text archive block keeps the block's timestamp
+        """
+        source, output = self.path / "block.txt", self.path / "out.jsonl"
+        checkpoint = self.path / "checkpoint.json"
+        lines = [
+            "2019/12/03 21:51",
+            "KJFK 032151Z 16008KT 10SM FEW034 27/23 A3013",
+            "KLGA 032151Z 16008KT 10SM FEW034 27/23 A3013",
+            "KEWR 032151Z 16008KT 10SM FEW034 27/23 A3013",
+        ]
+        # Stop after the first report then resume once the rest is written
+        source.write_text("\n".join(lines[:2]) + "\n")
+        state = archive.ingest(source, output, checkpoint, chunk_size=1, workers=1)
+        self.assertEqual(state["issued"], "2019-12-03T21:51:00+00:00")
+        source.write_text("\n".join(lines) + "\n")
+        state = archive.ingest(source, output, checkpoint, chunk_size=1, workers=1)
+        self.assertEqual(state["parsed"], 3)
+        lines = [json.loads(line) for line in output.open()]
+        self.assertEqual(
+            [line["data"]["station"] for line in lines], ["KJFK", "KLGA", "KEWR"]
+        )
+        for line in lines:
+            self.assertEqual(line["data"]["time"]["dt"], "2019-12-03T21:51:00+00:00")
@@ -0,0 +1,123 @@
+"""
+Parse Result Cache Tests
+"""
+
+# stdlib
+import time
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+# module
+from avwx import cache, metar, taf, translate
+
+METAR = "KJFK 032151Z 16008KT 10SM FEW034 FEW130 BKN250 27/23 A3013 RMK AO2 SLP201"
+TAF = (
+    "PHNL 042339Z 0500/0606 06018G25KT P6SM FEW030 SCT060 FM050600 06010KT "
+    "P6SM FEW025 SCT060 FM052000 06012G20KT P6SM FEW030 SCT060"
+)
+
+
+class TestMemoryCache(unittest.TestCase):
+    """
+    Tests the in-process cache backend
+    """
+
+    def test_lru(self):
+        """
+        Tests that the least recently used item is removed when full
+        """
+        store = cache.MemoryCache(maxsize=2)
+        store.set(("a",), 1)
+        store.set(("b",), 2)
+        self.assertEqual(store.get(("a",)), 1)
+        store.set(("c",), 3)
+        self.assertIsNone(store.get(("b",)))
+        self.assertEqual(store.get(("a",)), 1)
+        self.assertEqual(store.get(("c",)), 3)
+        info = store.info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (3, 1, 2))
+        store.clear()
+        self.assertIsNone(store.get(("a",)))
+
+    def test_backend_interface(self):
+        """
+        Tests that a backend missing part of the interface can't be created
+        """
+
+        class GetOnly(cache.CacheBackend):
+            def get(self, key: tuple) -> object:
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+    def test_ttl(self):
+        """
+        Tests that items expire after the time to live
+        """
+        store = cache.MemoryCache(ttl=0.01)
+        store.set(("a",), 1)
+        self.assertEqual(store.get(("a",)), 1)
+        time.sleep(0.02)
+        self.assertIsNone(store.get(("a",)))
+
+
+class TestCachedParse(unittest.TestCase):
+    """
+    Tests caching in front of the parse and translate functions
+    """
+
+    def setUp(self):
+        self.store = cache.MemoryCache()
+        cache.set_backend(self.store)
+
+    def tearDown(self):
+        cache.set_backend(None)
+
+    def test_disabled(self):
+        """
+        Tests that results are not shared without a backend
+        """
+        cache.set_backend(None)
+        self.assertIsNone(cache.get_backend())
+        self.assertIsNot(metar.parse("KJFK", METAR), metar.parse("KJFK", METAR))
+
+    def test_metar(self):
+        """
+        Tests that METAR parse and translation results are reused
+        """
+        data, units = metar.parse("KJFK", METAR)
+        self.assertIs(metar.parse("KJFK", METAR)[0], data)
+        self.assertIsNot(metar.parse("KJFK", METAR, date(2019, 7, 4))[0], data)
+        self.assertIsNot(metar.parse("KJFK", METAR, fields={"station"})[0], data)
+        trans = translate.metar(data, units)
+        self.assertIs(translate.metar(data, units), trans)
+        self.assertEqual(self.store.info()["hits"], 2)
+        # Projected data is translated on its own
+        fields = set(metar.FIELDS) - {"temperature", "dewpoint"}
+        partial = metar.parse("KJFK", METAR, fields=fields)[0]
+        self.assertIsNot(translate.metar(partial, units), trans)
+        self.assertEqual(translate.metar(partial, units).temperature, "")
+        self.assertIs(translate.metar(data, units), trans)
+
+    def test_reference_day(self):
+        """
+        Tests that aware issued times are keyed by the UTC day reports resolve against
+        """
+        eastern = timezone(timedelta(hours=-5))
+        issued = datetime(2020, 1, 1, 20, tzinfo=eastern)
+        self.assertEqual(cache._reference_day(issued), "2020-01-02")
+        self.assertEqual(cache._reference_day(datetime(2020, 1, 1, 20)), "2020-01-01")
+        self.assertEqual(cache._reference_day(date(2020, 1, 1)), "2020-01-01")
+        data, _ = metar.parse("KJFK", METAR, issued)
+        self.assertIs(metar.parse("KJFK", METAR, datetime(2020, 1, 2, 1))[0], data)
+        self.assertIsNot(metar.parse("KJFK", METAR, date(2020, 1, 1))[0], data)
+
+    def test_taf(self):
+        """
+        Tests that TAF parse and translation results are reused
+        """
+        data, units = taf.parse("PHNL", TAF)
+        self.assertIs(taf.parse("PHNL", TAF)[0], data)
+        trans = translate.taf(data, units)
+        self.assertIs(translate.taf(data, units), trans)
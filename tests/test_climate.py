@@ -0,0 +1,74 @@
+"""
+Climatology Tests
+"""
+
+# stdlib
+import unittest
+from datetime import datetime, timezone
+
+# library
+import numpy
+
+# module
+from avwx import climate, metar
+
+ISSUED = datetime(2019, 7, 4, tzinfo=timezone.utc)
+
+REPORTS = [
+    ("KJFK", "KJFK 032151Z 36010KT 10SM BKN250 27/23 A3013", ISSUED),
+    ("KJFK", "KJFK 032251Z 01020KT 2SM OVC008 27/23 A3013", ISSUED),
+    ("KJFK", "KJFK 032351Z 18004KT 10SM SCT250 27/23 A3013", ISSUED),
+    ("KJFK", "KJFK 040051Z 00000KT 10SM OVC020 27/23 A3013", ISSUED),
+    ("EGLL", "EGLL 032150Z 09010MPS 0800 OVC002 M01/M02 Q1013", ISSUED),
+    ("EGLL", "EGLL 032150Z VRB02KT 9999 BKN012 M01/M02 Q1013", ISSUED),
+    ("KXYZ", ""),
+]
+
+
+class TestClimate(unittest.TestCase):
+    """
+    Tests grouped climatology over parsed columns
+    """
+
+    def setUp(self):
+        self.data = metar.parse_columns(REPORTS)
+
+    def test_flight_rule_frequency(self):
+        """
+        Tests flight rule fractions by station, month, and hour
+        """
+        stations, freq = climate.flight_rule_frequency(self.data)
+        self.assertEqual(stations, ["EGLL", "KJFK", "KXYZ"])
+        self.assertEqual(freq.shape, (3, 12, 24, 4))
+        self.assertEqual(list(freq[0, 6, 21]), [0, 0.5, 0, 0.5])
+        self.assertEqual(list(freq[1, 6, 22]), [0, 0, 1, 0])
+        self.assertEqual(list(freq[1, 6, 0]), [0, 1, 0, 0])
+        self.assertTrue(numpy.isnan(freq[2]).all())
+        self.assertTrue(numpy.isnan(freq[1, 6, 12]).all())
+
+    def test_wind_rose(self):
+        """
+        Tests wind direction and speed fractions and calms
+        """
+        stations, rose, calm = climate.wind_rose(self.data, sectors=4, speeds=(1, 10))
+        self.assertEqual(rose.shape, (3, 4, 2))
+        self.assertEqual(rose[1].tolist(), [[0, 0.5], [0, 0], [0.25, 0], [0, 0]])
+        self.assertEqual(calm[1], 0.25)
+        # Variable winds are ignored and 10 m/s is 19 knots
+        self.assertEqual(rose[0, 1, 1], 1)
+        self.assertTrue(numpy.isnan(calm[2]))
+
+    def test_percentiles(self):
+        """
+        Tests per-station percentiles match numpy.percentile
+        """
+        q = (0, 10, 50, 90, 100)
+        stations, ceiling = climate.percentiles(self.data, "ceiling", q)
+        self.assertEqual(ceiling.shape, (3, 5))
+        self.assertEqual(
+            ceiling[1].tolist(), numpy.percentile([250, 8, 20], q).tolist()
+        )
+        self.assertEqual(ceiling[0].tolist(), numpy.percentile([2, 12], q).tolist())
+        self.assertTrue(numpy.isnan(ceiling[2]).all())
+        _, visibility = climate.percentiles(self.data, "visibility", (50,))
+        self.assertAlmostEqual(visibility[0, 0], 5399.5, places=1)
@@ -0,0 +1,85 @@
+"""
+Binary Codec Tests
+"""
+
+# stdlib
+import json
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# module
+from avwx import _core, codec, metar, pirep, structs, taf, translate
+
+METAR = "KJFK 032151Z 16008KT 10SM FEW034 FEW130 BKN250 27/23 A3013 RMK AO2 SLP201"
+
+
+class TestCodec(unittest.TestCase):
+    """
+    Tests encoding and decoding report structs
+    """
+
+    def assert_round_trip(self, value: object):
+        """
+        Asserts that a value decodes to an equal value of the same types
+        """
+        for compress in (True, False):
+            decoded = codec.decode(codec.encode(value, compress))
+            self.assertEqual(decoded, value)
+            self.assertIs(type(decoded), type(value))
+            if hasattr(value, "to_dict"):
+                self.assertEqual(decoded.to_dict(), value.to_dict())
+
+    def test_round_trip(self):
+        """
+        Tests that parsed end-to-end reports and translations round trip exactly
+        """
+        root = Path(__file__).parent
+        for kind, parser in (("metar", metar.parse), ("taf", taf.parse)):
+            for path in root.joinpath(kind).glob("*.json"):
+                data, units = parser(path.stem, json.load(path.open())["data"]["raw"])
+                self.assert_round_trip(data)
+                self.assert_round_trip((data, units))
+                self.assert_round_trip(getattr(translate, kind)(data, units))
+        for path in root.joinpath("pirep").glob("*.json"):
+            for report in json.load(path.open())["reports"]:
+                self.assert_round_trip(pirep.parse(report["data"]["raw"]))
+
+    def test_lazy_and_shared(self):
+        """
+        Tests that lazy fields stay unresolved and shared structs stay shared
+        """
+        _core.NUMBER_CACHE.clear()
+        data, _ = metar.parse("KJFK", METAR)
+        encoded = codec.encode([data, data])
+        decoded = codec.decode(encoded)
+        self.assertIs(decoded[0], decoded[1])
+        slot = structs.Number.spoken.slot
+        self.assertIsInstance(slot.__get__(decoded[0].altimeter), structs.Deferred)
+        self.assertEqual(decoded[0].altimeter.spoken, "three zero point one three")
+        self.assertIs(codec.decode(encoded)[0].clouds[0], decoded[0].clouds[0])
+
+    def test_datetime(self):
+        """
+        Tests that naive and offset datetimes keep their time zones
+        """
+        for value in (
+            datetime(2019, 12, 5, 23, 59, 1, 123),
+            datetime(2019, 12, 5, 12, tzinfo=timezone.utc),
+            datetime(2019, 12, 5, 12, tzinfo=timezone(timedelta(hours=-5))),
+        ):
+            timestamp = structs.Timestamp("051200Z", value)
+            decoded = codec.decode(codec.encode(timestamp))
+            self.assertEqual(decoded.dt, value)
+            self.assertEqual(decoded.dt.utcoffset(), value.utcoffset())
+
+    def test_errors(self):
+        """
+        Tests that bad data and unsupported values raise errors
+        """
+        data = codec.encode(metar.parse("KJFK", METAR, date(2019, 7, 4))[0])
+        for bad in (b"", b"PK\x01\x01", data[:2] + b"\x00" + data[3:], data[:20]):
+            with self.assertRaises(ValueError):
+                codec.decode(bad)
+        with self.assertRaises(TypeError):
+            codec.encode({"value": object()})
@@ -5,11 +5,12 @@ Core Tests
 # pylint: disable=E1101,C0103
 
 # stdlib
+import pickle
 import unittest
 
 # stdlib
 from copy import deepcopy
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 
 # module
 from avwx import _core, exceptions, static, structs
@@ -73,6 +74,37 @@ class TestGlobal(BaseTest):
         for nts in ("", "123456Z123", "1234", "1234Z"):
             self.assertFalse(_core.is_timestamp(nts))
 
+    def test_classify_token(self):
+        """
+        Tests tagging report elements with their token classes
+        """
+        for token, tags in (
+            ("09010KT", _core.TOKEN_WIND),
+            ("VRB05G15KT", _core.TOKEN_WIND),
+            ("G15", _core.TOKEN_GUST),
+            ("180V240", _core.TOKEN_VARIABLE_WIND),
+            ("10SM", _core.TOKEN_VISIBILITY),
+            ("9999", _core.TOKEN_VISIBILITY),
+            ("1200NDV", _core.TOKEN_VISIBILITY),
+            ("BKN015CB", _core.TOKEN_CLOUD),
+            ("VV003", _core.TOKEN_CLOUD),
+            ("R04/2000", _core.TOKEN_RVR),
+            ("WS020/24045KT", _core.TOKEN_WIND_SHEAR | _core.TOKEN_WIND),
+            ("M05/M07", _core.TOKEN_TEMP_DEW),
+            ("TX12/1316Z", _core.TOKEN_TEMP_MIN_MAX),
+            ("A2992", _core.TOKEN_ALTIMETER),
+            ("QNH2992INS", _core.TOKEN_ALTIMETER),
+            ("620304", _core.TOKEN_ICING),
+            ("530005", _core.TOKEN_TURBULENCE),
+            ("-TSRA", 0),
+            ("123456Z", 0),
+            ("1812/1817", _core.TOKEN_TIMERANGE | _core.TOKEN_TEMP_DEW),
+            ("6000", _core.TOKEN_VISIBILITY | _core.TOKEN_ICING),
+            ("KJFK", 0),
+            ("", 0),
+        ):
+            self.assertEqual(_core.classify_token(token), tags)
+
     def test_unpack_fraction(self):
         """
         Tests unpacking a fraction where the numerator can be greater than the denominator
@@ -153,6 +185,78 @@ class TestGlobal(BaseTest):
         self.assertEqual(number.value, 40)
         self.assertEqual(number.spoken, "zero four zero")
 
+    def test_lazy_number(self):
+        """
+        Tests that spoken and normalized strings are only built when read
+        """
+        _core.NUMBER_CACHE.clear()
+        number = _core.make_number("5/2")
+        self.assertIsInstance(
+            structs.Number.spoken.slot.__get__(number), structs.Deferred
+        )
+        self.assertIsInstance(
+            structs.Fraction.normalized.slot.__get__(number), structs.Deferred
+        )
+        self.assertEqual(number.spoken, "two and one half")
+        self.assertEqual(structs.Number.spoken.slot.__get__(number), "two and one half")
+        self.assertEqual(number.normalized, "2 1/2")
+        # Unresolved fields survive pickling
+        number = _core.make_number("12")
+        copied = pickle.loads(pickle.dumps(number))
+        self.assertIsInstance(
+            structs.Number.spoken.slot.__get__(copied), structs.Deferred
+        )
+        self.assertEqual(copied, number)
+        self.assertEqual(copied.spoken, "one two")
+
+    def test_shared_units(self):
+        """
+        Tests that units are shared between parses and changed by copy
+        """
+        units = _core.UNITS["NA"]
+        self.assertEqual(units, structs.Units(**static.NA_UNITS))
+        self.assertIs(_core.shared_units(structs.Units(**static.NA_UNITS)), units)
+        self.assertIs(_core.change_units(units, visibility="sm"), units)
+        changed = _core.change_units(units, visibility="m")
+        self.assertEqual(changed.visibility, "m")
+        self.assertEqual(units.visibility, "sm")
+        self.assertIs(_core.change_units(units, visibility="m"), changed)
+        with self.assertRaises(AttributeError):
+            units.visibility = "m"
+
+    def test_intern_token(self):
+        """
+        Tests that equal tokens from separate reports share one copy
+        """
+        first, second = "".join(["+", "RA"]), "".join(["+", "RA"])
+        self.assertIsNot(first, second)
+        self.assertIs(_core.intern_token(first), _core.intern_token(second))
+        other, *_ = _core.get_temp_and_dew("".join(["B", "R"]).split())
+        other2, *_ = _core.get_temp_and_dew("".join(["B", "R"]).split())
+        self.assertIs(other[0], other2[0])
+
+    def test_struct_cache(self):
+        """
+        Tests that built structs are shared, frozen, and counted by the cache
+        """
+        cache = _core.NUMBER_CACHE
+        cache.clear()
+        number = _core.make_number("10")
+        self.assertIs(_core.make_number("10"), number)
+        with self.assertRaises(AttributeError):
+            number.value = 20
+        info = cache.info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (1, 1, 1))
+        self.assertEqual(info["hit_rate"], 0.5)
+        self.assertIs(_core.make_cloud("BKN250"), _core.make_cloud("BKN250"))
+        try:
+            cache.resize(0)
+            self.assertIsNot(_core.make_number("10"), _core.make_number("10"))
+            self.assertEqual(_core.make_number("10"), number)
+            self.assertEqual(cache.info()["hit_rate"], 0.0)
+        finally:
+            cache.resize(4096)
+
     def test_find_first_in_list(self):
         """
         Tests a function which finds the first occurrence in a string from a list
@@ -225,9 +329,12 @@ class TestGlobal(BaseTest):
             ("OAKB 211230Z 360G17G32KT Q1011", "OAKB 211230Z 36017G32KT Q1011"),
             ("MHLC 090024Z 06012G22TK 5000", "MHLC 090024Z 06012G22KT 5000"),
             ("KJFK 1 1 1 1 1 1 2 1", "KJFK 1 2 1"),
+            ("KJFK TN05/1405ZTX20/1316Z", "KJFK TX20/1316Z TN05/1405Z"),
         ):
             line, fixed = line.split(), fixed.split()
+            original = list(line)
             self.assertEqual(_core.sanitize_report_list(line), fixed)
+            self.assertEqual(line, original)
 
     def test_is_possible_temp(self):
         """
@@ -293,7 +400,7 @@ class TestGlobal(BaseTest):
             (["VRB20G30KMH", "1"], "km/h", ("VRB",), ("20", 20), ("30", 30), []),
         ):
             units = structs.Units(**static.NA_UNITS)
-            wx, *winds, var = _core.get_wind(wx, units)
+            wx, *winds, var, units = _core.get_wind(wx, units)
             self.assertEqual(wx, ["1"])
             for i in range(len(wind)):
                 self.assert_number(winds[i], *wind[i])
@@ -322,7 +429,7 @@ class TestGlobal(BaseTest):
             (["2KM", "1"], "m", ("2000", 2000)),
         ):
             units = structs.Units(**static.NA_UNITS)
-            wx, vis = _core.get_visibility(wx, units)
+            wx, vis, units = _core.get_visibility(wx, units)
             self.assertEqual(wx, ["1"])
             self.assert_number(vis, *visibility)
             self.assertEqual(units.visibility, unit)
@@ -451,6 +558,26 @@ class TestGlobal(BaseTest):
         self.assertEqual(parsed.hour, today.hour)
         self.assertEqual(parsed.minute, today.minute)
 
+    def test_parse_date_issued(self):
+        """
+        Tests that report timestamps are resolved near a given issued date
+        """
+        for rts, issued, year, month, day in (
+            ("281530Z", date(2019, 3, 1), 2019, 2, 28),
+            ("011530Z", date(2019, 2, 28), 2019, 3, 1),
+            ("311530Z", datetime(2019, 1, 30, 12), 2019, 1, 31),
+            ("151530Z", date(2018, 12, 15), 2018, 12, 15),
+        ):
+            parsed = _core.parse_date(rts, issued=issued)
+            self.assertEqual(
+                (parsed.year, parsed.month, parsed.day), (year, month, day)
+            )
+            self.assertEqual((parsed.hour, parsed.minute), (15, 30))
+            self.assertEqual(parsed.tzinfo, timezone.utc)
+        parsed = _core.parse_date("1530", time_only=True, issued=date(2019, 3, 1))
+        self.assertEqual(parsed, datetime(2019, 3, 1, 15, 30, tzinfo=timezone.utc))
+        self.assertIsNone(_core.parse_date("123", issued=date(2019, 3, 1)))
+
     def test_make_timestamp(self):
         """
         Tests that a report timestamp is converted into a Timestamp dataclass
@@ -486,6 +613,30 @@ class TestMetar(BaseTest):
         line = "KJFK 36010 ? TSFEW004SCT012FEW///CBBKN080 C A V O K A2992"
         fixed = "KJFK 36010   TS FEW004 SCT012 FEW///CB BKN080 CAVOK A2992"
         self.assertEqual(_core.sanitize_report_string(line), fixed)
+        for line, fixed in (
+            ("KJFK RASCTSCT010", "KJFK RASCT SCT010"),
+            ("KJFK CBOVC //012FEW004OVC///", "KJFK CBOVC //012 FEW004 OVC///"),
+            ("KJFK BKN010 FEW020BKN030", "KJFK BKN010 FEW020BKN030"),
+            ("KJFK TSRAOVC", "KJFK TSRA OVC"),
+        ):
+            self.assertEqual(_core.sanitize_report_string(line), fixed)
+
+    def test_str_repl(self):
+        """
+        Tests that the compiled replacements match applying STR_REPL in order
+        """
+        for line in (
+            " VTB10KT VR05KT",
+            " CALMKKT ?VAR05KT",
+            " KKT VTB KLT BRV",
+            " C A V O K C A V O K ?C A V O K ",
+            " <1/4SM /34SM N0SIG V.TB",
+            ' 0I010KT `VRR05KT\' "CALMKLT "',
+        ):
+            expected = line
+            for key, rep in _core.STR_REPL.items():
+                expected = expected.replace(key, rep)
+            self.assertEqual(_core._STR_REPL(line), expected)
 
     def test_get_altimeter(self):
         """
@@ -502,7 +653,7 @@ class TestMetar(BaseTest):
             (["1", "2", "Q1000"], ("1000", 1000)),
         ):
             self.assertEqual(units.altimeter, "inHg")
-            retwx, ret_alt = _core.get_altimeter(wx, units)
+            retwx, ret_alt, units = _core.get_altimeter(wx, units)
             self.assertEqual(retwx, ["1", "2"])
             self.assert_number(ret_alt, *alt)
         # The last one should have changed the unit
@@ -518,7 +669,7 @@ class TestMetar(BaseTest):
             (["1", "2", "A2992"], ("2992", 29.92)),
         ):
             self.assertEqual(units.altimeter, "hPa")
-            retwx, ret_alt = _core.get_altimeter(wx, units, "IN")
+            retwx, ret_alt, units = _core.get_altimeter(wx, units, "IN")
             self.assertEqual(retwx, ["1", "2"])
             self.assert_number(ret_alt, *alt)
         # The last one should have changed the unit
@@ -0,0 +1,86 @@
+"""
+History Store Tests
+"""
+
+# stdlib
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# module
+from avwx import history, metar
+
+ISSUED = datetime(2019, 7, 4, tzinfo=timezone.utc)
+
+
+def jfk_report(day: int) -> (str, str, datetime):
+    """
+    Returns a KJFK record issued on a day in July 2019
+    """
+    report = f"KJFK {day:02}2151Z 16008KT 10SM BKN034 27/23 A3013"
+    return "KJFK", report, datetime(2019, 7, day, 22, tzinfo=timezone.utc)
+
+
+class TestHistoryStore(unittest.TestCase):
+    """
+    Tests appending and slicing station history
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.store = history.HistoryStore(self.tempdir.name)
+        reports = [jfk_report(day) for day in range(10, 0, -1)]
+        reports.append(("EGLL", "EGLL 032150Z 09010MPS 0800 M01/M02 Q1013", ISSUED))
+        reports.append(("KXYZ", ""))
+        self.assertEqual(self.store.append(metar.parse_columns(reports)), 11)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_append(self):
+        """
+        Tests that rows are split by station in time order with masks kept
+        """
+        self.assertEqual(self.store.stations(), ["EGLL", "KJFK"])
+        self.assertEqual(len(self.store), 11)
+        data = self.store.range("KJFK")
+        self.assertEqual(data.dtype.names, tuple(name for name, _ in metar.COLUMNS))
+        self.assertEqual([t.day for t in data["time"].tolist()], list(range(1, 11)))
+        self.assertEqual(set(data["station"]), {"KJFK"})
+        self.assertTrue(data["wind_gust"].mask.all())
+        self.assertEqual(list(data["ceiling"]), [34] * 10)
+        data = self.store.range("EGLL")
+        self.assertTrue(data["ceiling"].mask[0])
+        self.assertEqual(data["flight_rules"][0], 3)
+        old = metar.parse_columns([jfk_report(5)])
+        with self.assertRaises(ValueError):
+            self.store.append(old)
+        self.assertEqual(self.store.count("KJFK"), 10)
+
+    def test_slicing(self):
+        """
+        Tests time range and last n lookups
+        """
+        data = self.store.range("KJFK", datetime(2019, 7, 3), datetime(2019, 7, 5))
+        self.assertEqual([t.day for t in data["time"].tolist()], [3, 4])
+        start = datetime(2019, 7, 8, 17, 51, tzinfo=timezone(-timedelta(hours=4)))
+        data = self.store.range("KJFK", start=start)
+        self.assertEqual([t.day for t in data["time"].tolist()], [8, 9, 10])
+        data = self.store.last_n("KJFK", 3)
+        self.assertEqual([t.day for t in data["time"].tolist()], [8, 9, 10])
+        self.assertEqual(len(self.store.last_n("KJFK", 20)), 10)
+        self.assertEqual(len(self.store.range("KMCO")), 0)
+        self.assertEqual(len(self.store.last_n("KMCO", 1)), 0)
+
+    def test_interrupted_append(self):
+        """
+        Tests that a partly written append is ignored and then overwritten
+        """
+        path = self.store.path / "KJFK" / "wind_speed.bin"
+        with path.open("ab") as stream:
+            stream.write(b"\x00" * 6)
+        self.assertEqual(self.store.count("KJFK"), 10)
+        later = metar.parse_columns([jfk_report(11)])
+        self.store.append(later)
+        self.assertEqual(self.store.count("KJFK"), 11)
+        self.assertEqual(self.store.last_n("KJFK", 1)["wind_speed"][0], 8)
@@ -3,14 +3,16 @@ METAR Report Tests
 """
 
 # stdlib
+import io
 import json
+import pickle
 import unittest
-from dataclasses import asdict
-from datetime import datetime
+from dataclasses import FrozenInstanceError, asdict, replace
+from datetime import date, datetime, timezone
 from pathlib import Path
 
 # module
-from avwx import Metar, metar, structs
+from avwx import Metar, exceptions, metar, structs
 
 
 class TestMetar(unittest.TestCase):
@@ -31,6 +33,145 @@ class TestMetar(unittest.TestCase):
         self.assertIsInstance(data, structs.MetarData)
         self.assertIsInstance(units, structs.Units)
         self.assertEqual(data.raw, report)
+        data, _ = metar.parse(report[:4], report, issued=date(2019, 7, 4))
+        self.assertEqual(
+            data.time.dt, datetime(2019, 7, 3, 21, 51, tzinfo=timezone.utc)
+        )
+
+    def test_parse_fields(self):
+        """
+        Tests that only requested fields are parsed and returned
+        """
+        report = (
+            "KJFK 032151Z 16008KT 10SM FEW034 FEW130 BKN250 27/23 A3013 RMK AO2 SLP201"
+        )
+        full, _ = metar.parse(report[:4], report)
+        fields = {"station", "wind_speed", "flight_rules"}
+        data, units = metar.parse(report[:4], report, fields=fields)
+        self.assertIsInstance(units, structs.Units)
+        for key, value in asdict(data).items():
+            if key in fields:
+                self.assertEqual(value, asdict(full)[key])
+            else:
+                self.assertIsNone(value)
+        with self.assertRaises(ValueError):
+            metar.parse(report[:4], report, fields={"ceiling"})
+
+    def test_parse_many(self):
+        """
+        Tests batch parsing returns ordered results with errors in place
+        """
+        report = (
+            "KJFK 032151Z 16008KT 10SM FEW034 FEW130 BKN250 27/23 A3013 RMK AO2 SLP201"
+        )
+        reports = [("KJFK", report), ("12K", report), ("EGLL", "EGLL 032150Z 9999")]
+        for use_threads in (True, False):
+            results = metar.parse_many(reports, workers=2, use_threads=use_threads)
+            self.assertEqual(len(results), 3)
+            data, units = results[0]
+            self.assertIsInstance(data, structs.MetarData)
+            self.assertIsInstance(units, structs.Units)
+            self.assertEqual(data.raw, report)
+            self.assertIsInstance(results[1], exceptions.BadStation)
+            self.assertEqual(results[2][0].station, "EGLL")
+        results = metar.parse_many(
+            [("KJFK", report, date(2019, 7, 4)), ("KJFK", report)],
+            issued=date(2019, 8, 1),
+            workers=1,
+        )
+        self.assertEqual(results[0][0].time.dt.month, 7)
+        self.assertEqual(results[1][0].time.dt.month, 8)
+        self.assertEqual(metar.parse_many([]), [])
+
+    def test_parse_columns(self):
+        """
+        Tests batch parsing into masked columns with consistent units
+        """
+        reports = [
+            (
+                "KJFK",
+                "KJFK 032151Z 16008G20KT 10SM BKN250 27/23 A3013",
+                date(2019, 7, 4),
+            ),
+            ("EGLL", "EGLL 032150Z 09010MPS 0800 BKN002 M01/M02 Q1013"),
+            ("KMCO", "KMCO 032153Z VRB03KT P6SM OVC012 M01/M03 A2992"),
+            ("12K", "12K 032150Z 09010KT"),
+            ("KXYZ", ""),
+        ]
+        data = metar.parse_columns(reports, issued=date(2019, 8, 4))
+        self.assertEqual(data.dtype.names, tuple(name for name, _ in metar.COLUMNS))
+        self.assertEqual(list(data["station"]), ["KJFK", "EGLL", "KMCO", "12K", "KXYZ"])
+        self.assertEqual(str(data["time"][0]), "2019-07-03T21:51")
+        self.assertEqual(str(data["time"][1]), "2019-08-03T21:50")
+        self.assertEqual(data["wind_gust"][0], 20)
+        self.assertAlmostEqual(data["wind_speed"][1], 19.44, places=2)
+        self.assertAlmostEqual(data["visibility"][0], 16093.44, places=1)
+        self.assertAlmostEqual(data["visibility"][2], 9656.06, places=1)
+        self.assertAlmostEqual(data["altimeter"][0], 1020.32, places=2)
+        self.assertEqual(list(data["ceiling"][:3]), [250, 2, 12])
+        self.assertEqual(list(data["temperature"][:3]), [27, -1, -1])
+        self.assertEqual(list(data["flight_rules"][:3]), [0, 3, 1])
+        self.assertTrue(data["wind_gust"].mask[1])
+        self.assertTrue(data["wind_direction"].mask[2])
+        for name, _ in metar.COLUMNS[1:]:
+            self.assertTrue(data[name].mask[3:].all())
+        self.assertEqual(len(metar.parse_columns([])), 0)
+
+    def test_frozen_slots(self):
+        """
+        Tests that parsed data is immutable, slotted, and survives pickling
+        """
+        report = "EGLL 032150Z 09010KT 9999 FEW030 12/08 Q1013"
+        data, units = metar.parse("EGLL", report)
+        self.assertFalse(hasattr(data, "__dict__"))
+        self.assertFalse(hasattr(units, "__dict__"))
+        with self.assertRaises(FrozenInstanceError):
+            data.station = "KJFK"
+        copied = pickle.loads(pickle.dumps(data))
+        self.assertEqual(copied, data)
+        self.assertEqual(replace(data, station="KJFK").station, "KJFK")
+        self.assertIs(metar.parse("EGKK", report.replace("EGLL", "EGKK"))[1], units)
+
+    def test_to_json(self):
+        """
+        Tests serializing parsed data to dicts and JSON without asdict
+        """
+        report = (
+            "KJFK 032151Z 16008KT 10SM FEW034 FEW130 BKN250 27/23 A3013 RMK AO2 SLP201"
+        )
+        data, units = metar.parse(report[:4], report, issued=date(2019, 7, 4))
+        self.assertEqual(data.to_dict(), asdict(data))
+        self.assertEqual(units.to_dict(), asdict(units))
+        value = json.loads(data.to_json())
+        self.assertEqual(value["time"]["dt"], "2019-07-03T21:51:00+00:00")
+        self.assertEqual(value["clouds"], asdict(data)["clouds"])
+        stream = io.StringIO()
+        structs.write_json([data, None, data], stream)
+        value = json.loads(stream.getvalue())
+        self.assertEqual(len(value), 3)
+        self.assertIsNone(value[1])
+        self.assertEqual(value[2], json.loads(data.to_json()))
+
+    def test_lazy_translations(self):
+        """
+        Tests that translations, summary, and speech are calculated on first access
+        and reset when the report updates
+        """
+        report = (
+            "KJFK 032151Z 16008KT 10SM FEW034 FEW130 BKN250 27/23 A3013 RMK AO2 SLP201"
+        )
+        station = Metar("KJFK")
+        self.assertIsNone(station.translations)
+        station.update(report)
+        self.assertEqual(station._calculated, {})
+        translations = station.translations
+        self.assertIsInstance(translations, structs.MetarTrans)
+        self.assertIs(station.translations, translations)
+        self.assertIs(station.summary, station.summary)
+        self.assertIs(station.speech, station.speech)
+        station.update(report.replace("16008KT", "18010KT"))
+        self.assertEqual(station._calculated, {})
+        self.assertEqual(station.translations.wind, "S-180 at 10kt")
 
     def test_metar_ete(self):
         """
@@ -44,9 +185,14 @@ class TestMetar(unittest.TestCase):
             self.assertTrue(station.update(ref["data"]["raw"]))
             self.assertIsInstance(station.last_updated, datetime)
             # Clear timestamp due to parse_date limitations
-            station.data.time = None
-            self.assertEqual(asdict(station.data), ref["data"])
+            data = replace(station.data, time=None)
+            self.assertEqual(asdict(data), ref["data"])
+            self.assertEqual(data.to_dict(), ref["data"])
+            self.assertEqual(station.data.to_dict(), asdict(station.data))
+            self.assertEqual(station.translations.to_dict(), ref["translations"])
             self.assertEqual(asdict(station.translations), ref["translations"])
             self.assertEqual(station.summary, ref["summary"])
             self.assertEqual(station.speech, ref["speech"])
-            self.assertEqual(asdict(station.station_info), ref["station_info"])
+            # Runways are a tuple, which the JSON reference stores as a list
+            info = json.loads(json.dumps(asdict(station.station_info)))
+            self.assertEqual(info, ref["station_info"])
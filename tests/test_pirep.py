@@ -5,8 +5,8 @@ PIREP Report Tests
 # stdlib
 import json
 import unittest
-from dataclasses import asdict
-from datetime import datetime
+from dataclasses import asdict, replace
+from datetime import date, datetime
 from pathlib import Path
 
 # module
@@ -208,6 +208,8 @@ class TestPirep(unittest.TestCase):
             data = pirep.parse(report)
             self.assertIsInstance(data, structs.PirepData)
             self.assertEqual(data.raw, report)
+        data = pirep.parse("SMQ UA /OV BWZ/TM 0050/FL280", issued=date(2019, 2, 3))
+        self.assertEqual(data.time.dt.date(), date(2019, 2, 3))
 
     def test_pirep_ete(self):
         """
@@ -223,6 +225,9 @@ class TestPirep(unittest.TestCase):
             self.assertIsInstance(station.last_updated, datetime)
             for i, report in enumerate(ref["reports"]):
                 # Clear timestamp due to parse_date limitations
-                station.data[i].time = None
-                self.assertEqual(asdict(station.data[i]), report["data"])
-            self.assertEqual(asdict(station.station_info), ref["station_info"])
+                data = replace(station.data[i], time=None)
+                self.assertEqual(asdict(data), report["data"])
+                self.assertEqual(data.to_dict(), report["data"])
+            # Runways are a tuple, which the JSON reference stores as a list
+            info = json.loads(json.dumps(asdict(station.station_info)))
+            self.assertEqual(info, ref["station_info"])
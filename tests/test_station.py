@@ -3,8 +3,15 @@ Station Data Tests
 """
 
 # stdlib
+import pickle
+import tempfile
+from dataclasses import FrozenInstanceError
+from pathlib import Path
 from unittest import TestCase
 
+# library
+import numpy
+
 # module
 from avwx import exceptions, station
 
@@ -17,7 +24,7 @@ class TestStationFuncs(TestCase):
     def test_uses_na_format(self):
         """
         METAR and TAF reports come in two flavors: North American and International
-        
+
         uses_na_format should determine the format based on the station ident using prefixes
         """
         # NA idents
@@ -59,7 +66,7 @@ class TestStationFuncs(TestCase):
             (30, -82, 10, True, False, 0.2, 4),
             (30, -82, 10, False, False, 0.2, 5),
             (30, -82, 1000, True, True, 0.5, 5),
-            (30, -82, 1000, False, False, 0.5, 37),
+            (30, -82, 1000, False, False, 0.5, 44),
         ):
             stations = station.nearest(*params)
             self.assertEqual(len(stations), count)
@@ -69,19 +76,132 @@ class TestStationFuncs(TestCase):
                 for val in dist.values():
                     self.assertIsInstance(val, float)
 
+    def test_grid_index(self):
+        """
+        Tests that the grid index matches a brute force great circle search
+        """
+        rng = numpy.random.default_rng(4)
+        lats, lons = rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000)
+        index = station._GridIndex(lats, lons, size=5)
+        self.assertEqual(len(index), 2000)
+        for lat, lon, k, bound in (
+            (0, 0, 1, 10),
+            (45, 100, 25, 30),
+            (-89, -179, 5, 180),
+            (10, 179.5, 20, 15),
+            (-60, -179.5, 20, 15),
+            (88, 0, 10, 5),
+            (10, 10, 3000, 180),
+            (30, -80, 10, 0.1),
+        ):
+            dist, found = index.query(lat, lon, k, bound)
+            lat1, lat2 = numpy.radians(lats), numpy.radians(lat)
+            brute = numpy.degrees(
+                2
+                * numpy.arcsin(
+                    numpy.sqrt(
+                        numpy.sin((lat1 - lat2) / 2) ** 2
+                        + numpy.cos(lat1)
+                        * numpy.cos(lat2)
+                        * numpy.sin(numpy.radians(lons - lon) / 2) ** 2
+                    )
+                )
+            )
+            expected = numpy.sort(brute[brute <= bound])[:k]
+            self.assertTrue(numpy.allclose(dist, expected, rtol=0, atol=1e-9))
+            self.assertTrue(numpy.allclose(brute[found], dist, rtol=0, atol=1e-9))
+
+    def test_nearest_great_circle(self):
+        """
+        Tests nearest searches across +/-180 and distance limits in other units
+        """
+        for lat, lon in ((-16.55, 179.99), (-16.55, -179.99)):
+            stn = station.nearest(lat, lon, sends_reports=False)["station"]
+            self.assertEqual(stn.icao, "NFFR")
+        near = station.nearest(28.43, -81.31, 5, max_distance=10, unit="km")
+        self.assertEqual(len(near), 1)
+        self.assertEqual(near[0]["station"].icao, "KMCO")
+        dist = near[0]["station"].distance(28.43, -81.31)
+        self.assertAlmostEqual(near[0]["kilometers"], dist.kilometers)
+        self.assertAlmostEqual(near[0]["nautical_miles"], dist.nautical)
+        self.assertAlmostEqual(near[0]["miles"], dist.miles)
+        self.assertEqual(station.nearest(28.43, -81.31, 5, max_distance=0.01), [])
+        with self.assertRaises(ValueError):
+            station.nearest(28.43, -81.31, max_distance=10, unit="ft")
+
     def test_nearest_filter(self):
         """
         Tests filtering nearest stations
         """
         for airport, reports, count in (
-            (True, True, 6),
-            (True, False, 16),
-            (False, True, 6),
-            (False, False, 28),
+            (True, True, 10),
+            (True, False, 30),
+            (False, True, 10),
+            (False, False, 30),
         ):
             stations = station.nearest(30, -80, 30, airport, reports, 1.5)
             self.assertEqual(len(stations), count)
 
+    def test_nearest_many(self):
+        """
+        Tests that batch nearest searches match searching each point
+        """
+        lats, lons = [28.43, 30, -16.55, 89.9], [-81.31, -82, 179.99, 0]
+        for n, airport, reports, dist in (
+            (1, False, True, 10),
+            (5, True, True, 1),
+            (3, False, False, 0.5),
+        ):
+            near = station.nearest_many(
+                lats, lons, n, airport, reports, dist, stations=True
+            )
+            self.assertEqual(near["index"].shape, (4, n))
+            for i, (lat, lon) in enumerate(zip(lats, lons)):
+                expected = station.nearest(lat, lon, n, airport, reports, dist)
+                if isinstance(expected, dict):
+                    expected = [expected]
+                found = len(expected)
+                icaos = [item["station"].icao for item in expected]
+                self.assertEqual(near["icao"][i, :found].tolist(), icaos)
+                self.assertEqual(
+                    near["station"][i, :found].tolist(),
+                    [item["station"] for item in expected],
+                )
+                for key in ("coordinate_distance", "nautical_miles", "kilometers"):
+                    values = [item[key] for item in expected]
+                    self.assertTrue(numpy.allclose(near[key][i, :found], values))
+                self.assertTrue((near["index"][i, found:] == -1).all())
+                self.assertTrue(numpy.isnan(near["miles"][i, found:]).all())
+        near = station.nearest_many([28.43], [-81.31])
+        self.assertEqual(near["icao"].tolist(), [["KMCO"]])
+        self.assertEqual(list(station._STATIONS)[near["index"][0, 0]], "KMCO")
+        self.assertNotIn("station", near)
+
+    def test_station_table(self):
+        """
+        Tests that the binary station table decodes the same station dicts
+        """
+        stations = {icao: station._STATIONS[icao] for icao in ("KJFK", "EGLL", "FA18")}
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = Path(tempdir) / "stations.bin"
+            station._write_table(stations, path)
+            table = station._StationTable(path)
+            self.assertEqual(len(table), 3)
+            self.assertEqual(list(table), ["EGLL", "FA18", "KJFK"])
+            for icao, info in stations.items():
+                self.assertEqual(table[icao], info)
+            self.assertEqual(table.coords()[0][0], "EGLL")
+            self.assertEqual(table.ident_array().tolist(), ["EGLL", "FA18", "KJFK"])
+            self.assertEqual(table.flag_array().tolist(), [3, 2, 3])
+            for bad in ("KLAX", "AAAA", "ZZZZ", "kjfk", 1234, None, "ÉGLL"):
+                self.assertNotIn(bad, table)
+            # Outdated and truncated tables fall back to the JSON file
+            data = path.read_bytes()
+            self.assertEqual(list(Path(tempdir).iterdir()), [path])
+            for bad in (b"AVST" + bytes(12), b"AVST", data[:100], data[:-1]):
+                path.write_bytes(bad)
+                self.assertEqual(station._StationTable(path)["KLAX"]["icao"], "KLAX")
+
 
 class TestStation(TestCase):
     """
@@ -108,6 +228,24 @@ class TestStation(TestCase):
             with self.assertRaises(exceptions.BadStation):
                 station.Station.from_icao(bad)
 
+    def test_shared(self):
+        """
+        Tests that repeated lookups share one frozen Station
+        """
+        stn = station.Station.from_icao("KJFK")
+        self.assertIs(station.Station.from_icao("kjfk"), stn)
+        self.assertFalse(hasattr(stn, "__dict__"))
+        with self.assertRaises(FrozenInstanceError):
+            stn.name = "Idlewild"
+        with self.assertRaises(FrozenInstanceError):
+            stn.runways[0].length_ft = 0
+        with self.assertRaises(AttributeError):
+            stn.runways.append(stn.runways[0])
+        self.assertEqual(pickle.loads(pickle.dumps(stn)), stn)
+        hits = station.STATION_CACHE.info()["hits"]
+        station.Station.from_icao("KJFK")
+        self.assertEqual(station.STATION_CACHE.info()["hits"], hits + 1)
+
     def test_nearest(self):
         """
         Tests loading a Station nearest to a lat,lon coordinate pair
@@ -6,13 +6,12 @@ TAF Report Tests
 # stdlib
 import json
 import unittest
-from copy import deepcopy
-from dataclasses import asdict
-from datetime import datetime
+from dataclasses import asdict, replace
+from datetime import date, datetime
 from pathlib import Path
 
 # module
-from avwx import Taf, _core, structs, taf
+from avwx import Taf, _core, exceptions, structs, taf
 
 
 class TestTaf(unittest.TestCase):
@@ -34,6 +33,53 @@ class TestTaf(unittest.TestCase):
         self.assertIsInstance(data, structs.TafData)
         self.assertIsInstance(units, structs.Units)
         self.assertEqual(data.raw, report)
+        data, _ = taf.parse(report[:4], report, issued=date(2019, 12, 5))
+        self.assertEqual(data.time.dt.date(), date(2019, 12, 4))
+        self.assertEqual(data.forecast[-1].end_time.dt.date(), date(2019, 12, 6))
+
+    def test_parse_fields(self):
+        """
+        Tests that only requested report and forecast line fields are returned
+        """
+        report = (
+            "PHNL 042339Z 0500/0606 06018G25KT P6SM FEW030 SCT060 FM050600 06010KT "
+            "P6SM FEW025 SCT060 FM052000 06012G20KT P6SM FEW030 SCT060"
+        )
+        full, _ = taf.parse(report[:4], report)
+        data, _ = taf.parse(report[:4], report, fields={"station", "flight_rules"})
+        self.assertEqual(data.station, "PHNL")
+        self.assertIsNone(data.remarks)
+        self.assertEqual(len(data.forecast), len(full.forecast))
+        for line, full_line in zip(data.forecast, full.forecast):
+            self.assertEqual(line.flight_rules, full_line.flight_rules)
+            self.assertIsNone(line.visibility)
+        data, _ = taf.parse(report[:4], report, fields={"start_time", "end_time"})
+        self.assertEqual(data.start_time, full.start_time)
+        self.assertEqual(data.end_time, full.end_time)
+        self.assertEqual(data.forecast[0].start_time, full.forecast[0].start_time)
+        self.assertIsNone(data.forecast[0].wind_speed)
+        data, _ = taf.parse(report[:4], report, fields={"time"})
+        self.assertEqual(data.time, full.time)
+        self.assertIsNone(data.forecast)
+
+    def test_parse_many(self):
+        """
+        Tests batch parsing returns ordered results with errors in place
+        """
+        report = (
+            "PHNL 042339Z 0500/0606 06018G25KT P6SM FEW030 SCT060 FM050600 06010KT "
+            "P6SM FEW025 SCT060 FM052000 06012G20KT P6SM FEW030 SCT060"
+        )
+        reports = [("PHNL", report), ("12K", report)] * 3
+        for use_threads in (True, False):
+            results = taf.parse_many(reports, workers=2, use_threads=use_threads)
+            self.assertEqual(len(results), 6)
+            for i in range(0, 6, 2):
+                data, units = results[i]
+                self.assertIsInstance(data, structs.TafData)
+                self.assertIsInstance(units, structs.Units)
+                self.assertEqual(data.raw, report)
+                self.assertIsInstance(results[i + 1], exceptions.BadStation)
 
     def test_prob_line(self):
         """
@@ -132,17 +178,26 @@ class TestTaf(unittest.TestCase):
             self.assertTrue(station.update(ref["data"]["raw"]))
             self.assertIsInstance(station.last_updated, datetime)
             # Clear timestamp due to parse_date limitations
-            nodt = deepcopy(station.data)
-            for key in ("time", "start_time", "end_time"):
-                setattr(nodt, key, None)
-            for i in range(len(nodt.forecast)):
-                for key in ("start_time", "end_time"):
-                    setattr(nodt.forecast[i], key, None)
+            forecast = [
+                replace(line, start_time=None, end_time=None)
+                for line in station.data.forecast
+            ]
+            nodt = replace(
+                station.data,
+                time=None,
+                start_time=None,
+                end_time=None,
+                forecast=forecast,
+            )
             self.assertEqual(asdict(nodt), ref["data"])
+            self.assertEqual(nodt.to_dict(), ref["data"])
+            self.assertEqual(station.data.to_dict(), asdict(station.data))
             self.assertEqual(asdict(station.translations), ref["translations"])
             self.assertEqual(station.summary, ref["summary"])
             self.assertEqual(nodate(station.speech), nodate(ref["speech"]))
-            self.assertEqual(asdict(station.station_info), ref["station_info"])
+            # Runways are a tuple, which the JSON reference stores as a list
+            info = json.loads(json.dumps(asdict(station.station_info)))
+            self.assertEqual(info, ref["station_info"])
 
     def test_rule_inherit(self):
         """
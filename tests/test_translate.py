@@ -7,7 +7,7 @@ tests/test_translate.py
 import unittest
 
 # module
-from avwx import _core, static, structs, translate
+from avwx import _core, metar, static, structs, taf, translate
 
 
 class TestShared(unittest.TestCase):
@@ -339,3 +339,17 @@ class TestTaf(unittest.TestCase):
         for line in translated.forecast:
             self.assertIsInstance(line, structs.TafLineTrans)
         self.assertEqual(translated, trans)
+
+    def test_projected(self):
+        """
+        Tests that data parsed with fields raises a ValueError instead of translating
+        """
+        report = "KJFK 032151Z 16008KT 10SM FEW034 27/23 A3013 RMK AO2"
+        data, units = metar.parse("KJFK", report, fields={"temperature"})
+        with self.assertRaises(ValueError):
+            translate.metar(data, units)
+        report = "PHNL 042339Z 0500/0606 06018G25KT P6SM FEW030"
+        for fields in ({"station"}, {"wind_speed"}):
+            data, units = taf.parse("PHNL", report, fields=fields)
+            with self.assertRaises(ValueError):
+                translate.taf(data, units)
@@ -0,0 +1,68 @@
+"""
+Compares avwx.codec with pickle on the end-to-end test reports
+
+Prints the average encoded size and encode/decode time per report
+
+python util/bench_codec.py
+"""
+
+# stdlib
+import json
+import pickle
+import timeit
+from pathlib import Path
+
+# module
+from avwx import codec, metar, pirep, taf
+
+TEST_PATH = Path(__file__).parent.parent / "tests"
+REPEAT = 500
+
+
+def load_data(kind: str) -> list:
+    """
+    Returns the parsed data structs for the end-to-end test reports
+    """
+    data = []
+    for path in TEST_PATH.joinpath(kind).glob("*.json"):
+        ref = json.load(path.open())
+        if kind == "pirep":
+            for report in ref["reports"]:
+                data.append(pirep.parse(report["data"]["raw"]))
+        else:
+            parser = metar.parse if kind == "metar" else taf.parse
+            data.append(parser(path.stem, ref["data"]["raw"])[0])
+    return data
+
+
+def per_item(func: "Callable", items: list) -> float:
+    """
+    Returns the best average microseconds to call a function on each item
+    """
+    timer = timeit.Timer(lambda: [func(item) for item in items])
+    return min(timer.repeat(repeat=5, number=REPEAT)) / REPEAT / len(items) * 1e6
+
+
+def main() -> int:
+    """
+    Prints the size and speed of each encoding for each report type
+    """
+    methods = (
+        ("pickle", lambda value: pickle.dumps(value, pickle.HIGHEST_PROTOCOL)),
+        ("codec", codec.encode),
+        ("codec raw", lambda value: codec.encode(value, compress=False)),
+    )
+    print(f"{'':16}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    for kind in ("metar", "taf", "pirep"):
+        items = load_data(kind)
+        for name, encode in methods:
+            encoded = [encode(item) for item in items]
+            decode = pickle.loads if name == "pickle" else codec.decode
+            size = sum(len(data) for data in encoded) / len(encoded)
+            enc, dec = per_item(encode, items), per_item(decode, encoded)
+            print(f"{kind + ' ' + name:16}{size:8.0f}{enc:12.1f}{dec:12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
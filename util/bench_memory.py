@@ -0,0 +1,91 @@
+"""
+Measures the memory held by parsed reports
+
+Parses every end-to-end test report many times and keeps the results alive to find
+the average bytes retained per parsed METAR and TAF. Then compares the process RSS
+after holding a large synthetic corpus with and without token interning
+
+python util/bench_memory.py
+"""
+
+# stdlib
+import json
+import resource
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# module
+from avwx import _core, metar, taf
+
+TEST_PATH = Path(__file__).parent.parent / "tests"
+REPEAT = 200
+SYNTHETIC = 100_000
+
+
+def load_reports(kind: str) -> [(str, str)]:
+    """
+    Returns station, raw report pairs from the end-to-end test files
+    """
+    reports = []
+    for path in TEST_PATH.joinpath(kind).glob("*.json"):
+        reports.append((path.stem, json.load(path.open())["data"]["raw"]))
+    return reports
+
+
+def measure(parser: "Callable", reports: [(str, str)]) -> float:
+    """
+    Returns the average bytes retained per parsed report
+    """
+    # Warm the parser caches so they aren't counted against the reports
+    for station, report in reports:
+        parser(station, report)
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = [
+        parser(station, report) for _ in range(REPEAT) for station, report in reports
+    ]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size / len(kept)
+
+
+def measure_rss(intern: bool) -> float:
+    """
+    Returns the growth in max RSS in MB after parsing and holding the synthetic corpus
+
+    Run in a fresh process so earlier allocations don't hide the growth
+    """
+    if not intern:
+        _core.TOKEN_CACHE.resize(0)
+    corpus = []
+    for name, parser in (("metar", metar.parse), ("taf", taf.parse)):
+        reports = load_reports(name)
+        for i in range(SYNTHETIC // 2):
+            station, report = reports[i % len(reports)]
+            # Slicing gives every report its own raw string like a real archive
+            corpus.append((parser, station, report[:-1] + report[-1]))
+    start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    kept = [parser(station, report) for parser, station, report in corpus]
+    size = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start
+    del kept
+    return size / 1024
+
+
+def main() -> int:
+    """
+    Prints the bytes per parsed report for each report type and the synthetic RSS
+    """
+    for name, parser in (("METAR", metar.parse), ("TAF", taf.parse)):
+        reports = load_reports(name.lower())
+        print(f"{name}: {measure(parser, reports):,.0f} bytes per report")
+    for intern in (False, True):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            size = pool.submit(measure_rss, intern).result()
+        label = "with" if intern else "without"
+        print(f"{SYNTHETIC:,} reports {label} interning: {size:,.1f} MB RSS")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
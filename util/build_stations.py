@@ -6,6 +6,8 @@ http://ourairports.com/data/
 
 Source file for stations.txt can be downloaded from
 https://www.aviationweather.gov/docs/metar/stations.txt
+
+Also writes the memory-mapped stations.bin table used by avwx.station
 """
 
 # stdlib
@@ -14,6 +16,7 @@ import json
 from pathlib import Path
 
 # module
+from avwx.station import _write_table
 from find_bad_stations import BAD_PATH, GOOD_PATH, load_stations
 
 _DATA = Path("data")
@@ -21,6 +24,7 @@ AIRPORT_PATH = _DATA / "airports.csv"
 STATION_PATH = _DATA / "stations.txt"
 RUNWAY_PATH = _DATA / "runways.csv"
 OUTPUT_PATH = Path("..", "avwx", "stations.json")
+TABLE_PATH = Path("..", "avwx", "stations.bin")
 
 ACCEPTED_STATION_TYPES = [
     "balloonport",
@@ -191,7 +195,7 @@ def add_reporting(stations: dict) -> dict:
 
 def main() -> int:
     """
-    Build/update the stations.json master file
+    Build/update the stations.json master file and binary station table
     """
     clean_source_file()
     stations = build_stations()
@@ -199,6 +203,7 @@ def main() -> int:
     stations = add_reporting(stations)
     stations = add_runways(stations)
     json.dump(stations, OUTPUT_PATH.open("w"), sort_keys=True)
+    _write_table(stations, TABLE_PATH)
     return 0
 
 